@@ -5,7 +5,7 @@ This contains code for the Automatic Music Generator
 import random
 import mido
 import pygame
-from midi_generation import generate_track, combine_tracks
+from midi_generation import generate_track, combine_tracks, save_midi
 from playnotes import play_music
 from io import BytesIO
 import os
@@ -1633,9 +1633,9 @@ if __name__ == "__main__":
 
         #combining and playing music
         print("combining")
-        melody_midi = combine_tracks(tracks)
+        melody_midi = combine_tracks(tracks, repeats=8)
         pygame.init()
-        melody_midi.save("melo.mid")
+        save_midi(melody_midi, "melo.mid")
         pygame.mixer.music.load("melo.mid")
 
         pygame.mixer.music.play()
@@ -1,27 +1,47 @@
 """Contains the code for the user interface of AMG"""
 
 import pygame
+import time
+import sys
+import os
+from class_sample_bank import SampleBank
+from class_scheduler import Scheduler
 from amg import Loop, choose_chord, get_voicing, get_chord_name, notes_sharp, \
     notes_flat, key_sharp_or_flat, set_voicings, chord_sharp_or_flat
 
 
 class Sound:
-    """Represents a sound which has a name and sound file
+    """Represents a sound which has a name and sound file; the file is only
+    loaded, from the SampleBank bank, once the sound is first used
 
     @type name: str
-    @type sound: pygame.sound
+    @type sample: str
+        the sample's name in the SampleBank, e.g. 'bassF_'
+    @type volume: float
     """
 
-    def __init__(self, name, sound):
-        """Constructs a sound which has a name and sound
+    def __init__(self, name, sample, volume=1.0):
+        """Constructs a sound which has a name and sound file
 
         @type self: Sound
         @type name: str
-        @type sound: pygame.sound
+        @type sample: str
+        @type volume: float
         """
 
         self.name = name
-        self.sound = sound
+        self.sample = sample
+        self.volume = volume
+
+    @property
+    def sound(self):
+        """Returns the pygame sound of self, loading it if need be
+
+        @type self: Sound
+        @rtype: pygame.mixer.Sound
+        """
+
+        return bank.sound(self.sample, self.volume)
 
 
 class Key:
@@ -145,11 +165,127 @@ class Key:
                              (349, 402, 36, 126))
 
 
+class Meter:
+    """Represents the measurements of the UI taken in measurement mode
+
+    The process' CPU time is sampled every METER_MS; a sample in which no
+    input arrived counts as idle
+
+    @type cpu: float
+        process CPU seconds at the last sample
+    @type wall: float
+        seconds at the last sample
+    @type inputs: int
+        key presses and mouse clicks since the last sample
+    @type dequeued: float
+        seconds at which next_event() last took an input off the queue
+    @type idle_cpu: float
+    @type idle_wall: float
+    @type busy_cpu: float
+    @type busy_wall: float
+    @type dispatches: list[float]
+        seconds from next_event() taking each key press off the queue to its
+        melody note having been started and drawn; time the press waited in
+        the queue before that is not counted, as pygame does not expose when
+        an event arrived
+    """
+
+    def __init__(self):
+        """Constructs a Meter which starts measuring now
+
+        @type self: Meter
+        @rtype: None
+        """
+
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        self.inputs = 0
+        self.dequeued = self.wall
+        self.idle_cpu = 0.0
+        self.idle_wall = 0.0
+        self.busy_cpu = 0.0
+        self.busy_wall = 0.0
+        self.dispatches = []
+
+    def sample(self):
+        """Adds the CPU time used since the last sample to the idle or busy
+        totals of self
+
+        @type self: Meter
+        @rtype: None
+        """
+
+        cpu = time.process_time()
+        wall = time.perf_counter()
+
+        if self.inputs == 0:
+            self.idle_cpu += cpu - self.cpu
+            self.idle_wall += wall - self.wall
+        else:
+            self.busy_cpu += cpu - self.cpu
+            self.busy_wall += wall - self.wall
+
+        self.cpu = cpu
+        self.wall = wall
+        self.inputs = 0
+
+    def report(self):
+        """Returns the CPU use of the UI, in percent of one core, and its
+        dispatch latency from dequeued key press to sound, in milliseconds;
+        the mixer's buffer is added to it, as a sound is heard at most that
+        long after play()
+
+        @type self: Meter
+        @rtype: dict{str: float}
+        """
+
+        buffer_ms = 1000 * MIXER_BUFFER / pygame.mixer.get_init()[0]
+        dispatches = sorted(self.dispatches) or [0.0]
+
+        return {'idle_s': self.idle_wall,
+                'idle_cpu': 100 * self.idle_cpu / max(self.idle_wall, 1e-9),
+                'busy_cpu': 100 * self.busy_cpu / max(self.busy_wall, 1e-9),
+                'notes': len(self.dispatches),
+                'dispatch_ms': 1000 * dispatches[len(dispatches) // 2] +
+                buffer_ms,
+                'max_dispatch_ms': 1000 * dispatches[-1] + buffer_ms}
+
+
 FONT_FAMILY = 'Arial'
 FONT_HEIGHT = 30
 WIDTH = 1024
 HEIGHT = 768
 
+# Seconds each chord of a loop is played for
+CHORD_SECONDS = 2.97
+
+# Posted by the playback scheduler when a chord starts; its count is the
+# chord's index in the loop
+CHORD_EVENT = pygame.USEREVENT + 1
+
+# The display is flipped at most this many times a second; drawing only
+# marks it as changed (see request_flip())
+FRAME_RATE = 30
+
+# Frames of the mixer's buffer; sound starts at most this late after play()
+MIXER_BUFFER = 512
+
+# If True (run with --measure), CPU use is sampled every METER_MS, the
+# dispatch latency of melody keys is timed, and both are reported on exit
+MEASURE_UI = '--measure' in sys.argv
+METER_MS = 1000
+METER_EVENT = pygame.USEREVENT + 2
+
+# Keys which play the melody, from C0 up to F1
+melody_keys = (pygame.K_a, pygame.K_w, pygame.K_s, pygame.K_e, pygame.K_d,
+               pygame.K_f, pygame.K_t, pygame.K_g, pygame.K_y, pygame.K_h,
+               pygame.K_u, pygame.K_j, pygame.K_k, pygame.K_o, pygame.K_l,
+               pygame.K_p, pygame.K_SEMICOLON, pygame.K_RETURN)
+
+# Whether the display has changed since it was last flipped, and when it
+# was last flipped, in pygame ticks
+display_state = {'changed': False, 'flipped': 0}
+
 
 def render_display(screen):
     """Render stuff to the given screen.
@@ -278,6 +414,75 @@ def render_display(screen):
     pygame.display.flip()
 
 
+def request_flip():
+    """Marks the display as changed; it is flipped by next_event()
+
+    @rtype: None
+    """
+
+    display_state['changed'] = True
+
+
+def flip_display():
+    """Flips the display if it has changed and a frame (at FRAME_RATE) has
+    passed since it was last flipped; returns the milliseconds until it may
+    be flipped, or 0 if it has not changed
+
+    @rtype: int
+    """
+
+    if not display_state['changed']:
+        return 0
+
+    wait = display_state['flipped'] + 1000 // FRAME_RATE - \
+        pygame.time.get_ticks()
+    if wait > 0:
+        return wait
+
+    pygame.display.flip()
+    display_state['changed'] = False
+    display_state['flipped'] = pygame.time.get_ticks()
+    return 0
+
+
+def next_event():
+    """Returns the next event, flipping the display while waiting for it
+
+    The thread sleeps until an event arrives, or until the display may be
+    flipped, so that an idle UI uses no CPU
+
+    @rtype: pygame.event.Event
+    """
+
+    while True:
+        event = pygame.event.wait(flip_display())
+
+        if event.type == pygame.NOEVENT:
+            continue
+        if event.type == METER_EVENT:
+            meter.sample()
+            continue
+        if MEASURE_UI and event.type in (pygame.KEYDOWN,
+                                         pygame.MOUSEBUTTONUP):
+            meter.inputs += 1
+            meter.dequeued = time.perf_counter()
+
+        return event
+
+
+def play_key(event):
+    """Plays the melody note of a key press; in measurement mode, the time
+    since next_event() took the press off the queue is recorded
+
+    @type event: pygame.event
+    @rtype: None
+    """
+
+    play_melody(event)
+    if MEASURE_UI and event.key in melody_keys:
+        meter.dispatches.append(time.perf_counter() - meter.dequeued)
+
+
 def event_loop(screen):
     """Respond to events (mouse clicks, key presses) and update the display.
 
@@ -296,12 +501,12 @@ def event_loop(screen):
 
     while True:
         # Wait for an event
-        event = pygame.event.poll()
+        event = next_event()
         if event.type == pygame.QUIT:
             return
 
         elif event.type == pygame.KEYDOWN:
-            play_melody(event)
+            play_key(event)
 
         elif event.type == pygame.KEYUP:
             stop_melody(event)
@@ -314,35 +519,35 @@ def event_loop(screen):
                 selected_mellow = 0
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (52, 152, 21, 21))
-                pygame.display.flip()
+                request_flip()
             elif 90 <= event.pos[0] <= 115 and 150 <= event.pos[1] <= 175:
                 # mellow = 1
                 erase_previous_rating(selected_mellow, 152)
                 selected_mellow = 1
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (92, 152, 21, 21))
-                pygame.display.flip()
+                request_flip()
             elif 130 <= event.pos[0] <= 155 and 150 <= event.pos[1] <= 175:
                 # mellow = 2
                 erase_previous_rating(selected_mellow, 152)
                 selected_mellow = 2
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (132, 152, 21, 21))
-                pygame.display.flip()
+                request_flip()
             elif 170 <= event.pos[0] <= 195 and 150 <= event.pos[1] <= 175:
                 # mellow = 3
                 erase_previous_rating(selected_mellow, 152)
                 selected_mellow = 3
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (172, 152, 21, 21))
-                pygame.display.flip()
+                request_flip()
             elif 210 <= event.pos[0] <= 235 and 150 <= event.pos[1] <= 175:
                 # mellow = 4
                 erase_previous_rating(selected_mellow, 152)
                 selected_mellow = 4
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (212, 152, 21, 21))
-                pygame.display.flip()
+                request_flip()
 
             # depth ratings
             elif 50 <= event.pos[0] <= 75 and 300 <= event.pos[1] <= 325:
@@ -352,35 +557,35 @@ def event_loop(screen):
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (52, 302, 21, 21))
 
-                pygame.display.flip()
+                request_flip()
             elif 90 <= event.pos[0] <= 115 and 300 <= event.pos[1] <= 325:
                 # depth = 1
                 erase_previous_rating(selected_depth, 302)
                 selected_depth = 1
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (92, 302, 21, 21))
-                pygame.display.flip()
+                request_flip()
             elif 130 <= event.pos[0] <= 155 and 300 <= event.pos[1] <= 325:
                 # depth = 2
                 erase_previous_rating(selected_depth, 302)
                 selected_depth = 2
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (132, 302, 21, 21))
-                pygame.display.flip()
+                request_flip()
             elif 170 <= event.pos[0] <= 195 and 300 <= event.pos[1] <= 325:
                 # depth = 3
                 erase_previous_rating(selected_depth, 302)
                 selected_depth = 3
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (172, 302, 21, 21))
-                pygame.display.flip()
+                request_flip()
             elif 210 <= event.pos[0] <= 235 and 300 <= event.pos[1] <= 325:
                 # depth = 4
                 erase_previous_rating(selected_depth, 302)
                 selected_depth = 4
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (212, 302, 21, 21))
-                pygame.display.flip()
+                request_flip()
 
             # loop length
             elif 340 <= event.pos[0] <= 365 and 150 <= event.pos[1] <= 175:
@@ -390,7 +595,7 @@ def event_loop(screen):
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (342, 152, 21, 21))
                 draw_loop_numbers(screen)
-                pygame.display.flip()
+                request_flip()
             elif 380 <= event.pos[0] <= 405 and 150 <= event.pos[1] <= 175:
                 # loop = 4
                 erase_previous_loop(selected_loop)
@@ -398,7 +603,7 @@ def event_loop(screen):
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (382, 152, 21, 21))
                 draw_loop_numbers(screen)
-                pygame.display.flip()
+                request_flip()
             elif 420 <= event.pos[0] <= 445 and 150 <= event.pos[1] <= 175:
                 # loop = 8
                 erase_previous_loop(selected_loop)
@@ -406,7 +611,7 @@ def event_loop(screen):
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (422, 152, 21, 21))
                 draw_loop_numbers(screen)
-                pygame.display.flip()
+                request_flip()
             elif 460 <= event.pos[0] <= 485 and 150 <= event.pos[1] <= 175:
                 # loop = 16
                 erase_previous_loop(selected_loop)
@@ -414,7 +619,7 @@ def event_loop(screen):
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tomato'],
                                  (462, 152, 21, 21))
                 draw_loop_numbers(screen)
-                pygame.display.flip()
+                request_flip()
 
             # 'create' button was pressed 350, 230, 120, 40
             elif 350 <= event.pos[0] <= 470 and 230 <= event.pos[1] <= 270:
@@ -449,7 +654,7 @@ def event_loop(screen):
                     text_pos = coordinates
                     screen.blit(text_surface, text_pos)
 
-                    pygame.display.flip()
+                    request_flip()
 
                     coordinates[1] += 20
 
@@ -478,90 +683,124 @@ def event_loop(screen):
                 play_chords(loop_chords, bass_keys, loop_chord_objects, loop)
 
 
+def chord_sounds(chord_change, bass_name):
+    """Returns the harmony sounds of a chord, followed by its bass sound
+
+    @type chord_change: list[str]
+    @type bass_name: str
+    @rtype: list[Sound]
+    """
+
+    return [note for note in harmony_notes if note.name in chord_change] + \
+        [bass_note for bass_note in bass_notes if bass_note.name == bass_name]
+
+
+def chord_schedule(chords, bass):
+    """Returns the events which play one pass of the chords, each lasting
+    CHORD_SECONDS, for a Scheduler, and every harmony and bass sound they
+    play; every sound is loaded beforehand
+
+    @type chords: list[list[str]]
+    @type bass: list[str]
+    @rtype: (list[(float, function, tuple)], list[pygame.mixer.Sound])
+    """
+
+    events = []
+    loop_sounds = []
+    percussion = [perc.sound for perc in (perc_deep, perc_mid, perc_high)]
+
+    for count, chord_change in enumerate(chords):
+        start = count * CHORD_SECONDS
+        chord = [note.sound
+                 for note in chord_sounds(chord_change, bass[count])]
+        loop_sounds.extend(curr_sound for curr_sound in chord
+                           if curr_sound not in loop_sounds)
+
+        for perc in percussion:
+            events.append((start, perc.stop, ()))
+            events.append((start, perc.play, ()))
+        for curr_sound in chord:
+            events.append((start, curr_sound.play, ()))
+        events.append((start, pygame.event.post,
+                       (pygame.event.Event(CHORD_EVENT, count=count),)))
+
+        # Faded out as the next chord starts, before it is played
+        for curr_sound in chord:
+            events.append((start + CHORD_SECONDS, curr_sound.fadeout, (300,)))
+
+    return events, loop_sounds
+
+
 def play_chords(chords, bass, loop_chord_objects, current_loop):
     """Plays the chords which are indicated by the parameter chords
 
+    The chords are played by a Scheduler on a thread of its own; this thread
+    only redraws the display as each chord starts, plays the melody, and
+    waits for the 'stop' button
+
     @type chords: list[list[str]]
     @type bass: list[str]
     @type loop_chord_objects: list[Chord]
     @type current_loop: Loop
     @rtype: None
     """
-    while True:
-        count = -1
-
-        for chord_change in chords:
-            perc_deep.stop()
-            perc_mid.stop()
-            perc_high.stop()
-            perc_deep.play()
-            perc_mid.play()
-            perc_high.play()
-
-            notes_played = []
-            bass_played = None
-            for note in harmony_notes:
-                if note.name in chord_change:
-                    note.sound.play()
-                    notes_played.append(note)
 
+    events, loop_sounds = chord_schedule(chords, bass)
+    scheduler = Scheduler(events, period=CHORD_SECONDS * len(chords))
+    scheduler.start()
+
+    while True:
+        event = next_event()
+        if event.type == CHORD_EVENT:
+            count = event.count
             for key in keys:
                 key.in_scale = False
 
-            time1 = pygame.time.get_ticks()
-            count += 1  # counter used to keep track of bass note & dashed line
-
-            for bass_note in bass_notes:
-                if bass_note.name == bass[count]:
-                    bass_note.sound.play()
-                    bass_played = bass_note
-
             if count == 0:
                 pygame.draw.rect(screen, pygame.color.THECOLORS['black'],
                                  (605, 45, 12, 3))
 
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                                  (605, 45 + 20 * (len(chords) - 1), 12, 3))
-                pygame.display.flip()
+                request_flip()
             else:
                 pygame.draw.rect(screen, pygame.color.THECOLORS['black'],
                                  (605, 45 + 20 * count, 12, 3))
 
                 pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                                  (605, 45 + 20 * (count - 1), 12, 3))
-                pygame.display.flip()
+                request_flip()
 
             draw_piano()
             draw_chord_scale(loop_chord_objects[count], current_loop)
 
-            forward = False
-            while not forward:
-                event = pygame.event.poll()
-                if event.type == pygame.MOUSEBUTTONUP:
-                    if 350 <= event.pos[0] <= 470 and \
-                            285 <= event.pos[1] <= 325:
-                        for note in notes_played:
-                            note.sound.fadeout(400)
-                        bass_played.sound.fadeout(400)
-                        perc_deep.fadeout(400)
-                        perc_mid.fadeout(400)
-                        perc_high.fadeout(400)
-                        # draw_piano()
-                        for key in keys:
-                            key.in_scale = False
-                        return
-
-                elif event.type == pygame.KEYDOWN:
-                    play_melody(event)
-
-                elif event.type == pygame.KEYUP:
-                    stop_melody(event)
-
-                if pygame.time.get_ticks() > time1 + 2970:
-                    for note in notes_played:
-                        note.sound.fadeout(300)
-                    bass_played.sound.fadeout(300)
-                    forward = True
+        elif event.type == pygame.QUIT or (
+                event.type == pygame.MOUSEBUTTONUP and
+                350 <= event.pos[0] <= 470 and 285 <= event.pos[1] <= 325):
+            # Once stopped, nothing more is started; every chord sound is
+            # faded, as the scheduler may have started a chord whose
+            # CHORD_EVENT is still queued
+            scheduler.stop()
+            for curr_sound in loop_sounds:
+                curr_sound.fadeout(400)
+            perc_deep.sound.fadeout(400)
+            perc_mid.sound.fadeout(400)
+            perc_high.sound.fadeout(400)
+            # draw_piano()
+            for key in keys:
+                key.in_scale = False
+
+            # Chord events still queued belong to this loop
+            pygame.event.clear(CHORD_EVENT)
+            if event.type == pygame.QUIT:
+                pygame.event.post(event)
+            return
+
+        elif event.type == pygame.KEYDOWN:
+            play_key(event)
+
+        elif event.type == pygame.KEYUP:
+            stop_melody(event)
 
 
 def play_melody(event):
@@ -642,7 +881,7 @@ def play_melody(event):
         F1k.pressed = True
         F1.sound.play()
         F1k.draw_key('red3')
-    pygame.display.flip()
+    request_flip()
 
 
 def stop_melody(event):
@@ -761,7 +1000,7 @@ def stop_melody(event):
         F1k.pressed = False
         pygame.draw.rect(screen, pygame.color.THECOLORS[key_to_color(F1k)],
                          (694, 402, 61, 196))
-    pygame.display.flip()
+    request_flip()
 
 
 def key_to_color(key):
@@ -899,7 +1138,7 @@ def draw_chord_scale(chord, current_loop):
         if not Ab0k.pressed:
             Ab0k.draw_key('tomato')
 
-    pygame.display.flip()
+    request_flip()
 
 
 def draw_piano():
@@ -926,7 +1165,7 @@ def draw_piano():
         if key.pressed:
             key.draw_key('red3')
 
-    pygame.display.flip()
+    request_flip()
 
 
 def erase_previous_rating(rating, y):
@@ -939,23 +1178,23 @@ def erase_previous_rating(rating, y):
     if rating == 0:
         pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                          (52, y, 21, 21))
-        pygame.display.flip()
+        request_flip()
     elif rating == 1:
         pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                          (92, y, 21, 21))
-        pygame.display.flip()
+        request_flip()
     elif rating == 2:
         pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                          (132, y, 21, 21))
-        pygame.display.flip()
+        request_flip()
     elif rating == 3:
         pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                          (172, y, 21, 21))
-        pygame.display.flip()
+        request_flip()
     else:  # rating == 4
         pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                          (212, y, 21, 21))
-        pygame.display.flip()
+        request_flip()
 
 
 def erase_previous_loop(loop):
@@ -967,19 +1206,19 @@ def erase_previous_loop(loop):
     if loop == 2:
         pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                          (342, 152, 21, 21))
-        pygame.display.flip()
+        request_flip()
     elif loop == 4:
         pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                          (382, 152, 21, 21))
-        pygame.display.flip()
+        request_flip()
     elif loop == 8:
         pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                          (422, 152, 21, 21))
-        pygame.display.flip()
+        request_flip()
     else:  # loop == 16
         pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                          (462, 152, 21, 21))
-        pygame.display.flip()
+        request_flip()
 
 
 def draw_loop_numbers(screen):
@@ -1007,83 +1246,78 @@ def draw_loop_numbers(screen):
     screen.blit(text_surface, text_pos)
 
     # This must be called *after* all other pygame functions have run.
-    pygame.display.flip()
+    request_flip()
 
 
 if __name__ == '__main__':
 
     # Setup pygame
+    pygame.mixer.pre_init(buffer=MIXER_BUFFER)
     pygame.init()
     screen = pygame.display.set_mode((800, 650))
 
     pygame.mixer.init()
     pygame.mixer.set_num_channels(40)
 
-    A = Sound('A', pygame.mixer.Sound('A.wav'))
-    Bb = Sound('Bb', pygame.mixer.Sound('Bb.wav'))
-    B = Sound('B', pygame.mixer.Sound('B.wav'))
-    C = Sound('C', pygame.mixer.Sound('C.wav'))
-    Db = Sound('Db', pygame.mixer.Sound('Db.wav'))
-    D = Sound('D', pygame.mixer.Sound('D.wav'))
-    Eb = Sound('Eb', pygame.mixer.Sound('Eb.wav'))
-    E = Sound('E', pygame.mixer.Sound('E.wav'))
-    F = Sound('F', pygame.mixer.Sound('F.wav'))
-    F_ = Sound('F#', pygame.mixer.Sound('F_.wav'))
-    G = Sound('G', pygame.mixer.Sound('G.wav'))
-    Ab = Sound('Ab', pygame.mixer.Sound('Ab.wav'))
+    # Samples are only read once played; a chord, its bass, the percussion
+    # and a few melody keys fit in the bank at once. Every Sound holds its
+    # own copy of its frames, so derived frames are not kept besides
+    bank = SampleBank(os.path.dirname(os.path.abspath(__file__)), capacity=24,
+                      derived_capacity=0)
+
+    A = Sound('A', 'A', 0.5)
+    Bb = Sound('Bb', 'Bb', 0.5)
+    B = Sound('B', 'B', 0.5)
+    C = Sound('C', 'C', 0.5)
+    Db = Sound('Db', 'Db', 0.5)
+    D = Sound('D', 'D', 0.5)
+    Eb = Sound('Eb', 'Eb', 0.5)
+    E = Sound('E', 'E', 0.5)
+    F = Sound('F', 'F', 0.5)
+    F_ = Sound('F#', 'F_', 0.5)
+    G = Sound('G', 'G', 0.5)
+    Ab = Sound('Ab', 'Ab', 0.5)
     harmony_notes = [A, Bb, B, C, Db, D, Eb, E, F, F_, G, Ab]
 
-    for harmony_note in harmony_notes:
-        harmony_note.sound.set_volume(0.5)
-
-    bassA = Sound('A', pygame.mixer.Sound('bassA.wav'))
-    bassBb = Sound('Bb', pygame.mixer.Sound('bassBb.wav'))
-    bassB = Sound('B', pygame.mixer.Sound('bassB.wav'))
-    bassC = Sound('C', pygame.mixer.Sound('bassC.wav'))
-    bassDb = Sound('Db', pygame.mixer.Sound('bassDb.wav'))
-    bassD = Sound('D', pygame.mixer.Sound('bassD.wav'))
-    bassEb = Sound('Eb', pygame.mixer.Sound('bassEb.wav'))
-    bassE = Sound('E', pygame.mixer.Sound('bassE.wav'))
-    bassF = Sound('F', pygame.mixer.Sound('bassF.wav'))
-    bassF_ = Sound('F#', pygame.mixer.Sound('bassF_.wav'))
-    bassG = Sound('G', pygame.mixer.Sound('bassG.wav'))
-    bassAb = Sound('Ab', pygame.mixer.Sound('bassAb.wav'))
+    bassA = Sound('A', 'bassA', 0.7)
+    bassBb = Sound('Bb', 'bassBb', 0.7)
+    bassB = Sound('B', 'bassB', 0.7)
+    bassC = Sound('C', 'bassC', 0.7)
+    bassDb = Sound('Db', 'bassDb', 0.7)
+    bassD = Sound('D', 'bassD', 0.7)
+    bassEb = Sound('Eb', 'bassEb', 0.7)
+    bassE = Sound('E', 'bassE', 0.7)
+    bassF = Sound('F', 'bassF', 0.7)
+    bassF_ = Sound('F#', 'bassF_', 0.7)
+    bassG = Sound('G', 'bassG', 0.7)
+    bassAb = Sound('Ab', 'bassAb', 0.7)
     bass_notes = [bassA, bassBb, bassB, bassC, bassDb, bassD, bassEb, bassE,
                   bassF, bassF_, bassG, bassAb]
 
-    for bass_note in bass_notes:
-        bass_note.sound.set_volume(0.7)
-
-    C0 = Sound('C', pygame.mixer.Sound('C0.wav'))
-    Db0 = Sound('Db', pygame.mixer.Sound('Db0.wav'))
-    D0 = Sound('D', pygame.mixer.Sound('D0.wav'))
-    Eb0 = Sound('Eb', pygame.mixer.Sound('Eb0.wav'))
-    E0 = Sound('E', pygame.mixer.Sound('E0.wav'))
-    F0 = Sound('F', pygame.mixer.Sound('F0.wav'))
-    F_0 = Sound('F#', pygame.mixer.Sound('F_0.wav'))
-    G0 = Sound('G', pygame.mixer.Sound('G0.wav'))
-    Ab0 = Sound('Ab', pygame.mixer.Sound('Ab0.wav'))
-    A0 = Sound('A', pygame.mixer.Sound('A0.wav'))
-    Bb0 = Sound('Bb', pygame.mixer.Sound('Bb0.wav'))
-    B0 = Sound('B', pygame.mixer.Sound('B0.wav'))
-    C1 = Sound('C', pygame.mixer.Sound('C1.wav'))
-    Db1 = Sound('Db', pygame.mixer.Sound('Db1.wav'))
-    D1 = Sound('D', pygame.mixer.Sound('D1.wav'))
-    Eb1 = Sound('Eb', pygame.mixer.Sound('Eb1.wav'))
-    E1 = Sound('E', pygame.mixer.Sound('E1.wav'))
-    F1 = Sound('F', pygame.mixer.Sound('F1.wav'))
+    C0 = Sound('C', 'C0', 1.0)
+    Db0 = Sound('Db', 'Db0', 1.0)
+    D0 = Sound('D', 'D0', 1.0)
+    Eb0 = Sound('Eb', 'Eb0', 1.0)
+    E0 = Sound('E', 'E0', 1.0)
+    F0 = Sound('F', 'F0', 1.0)
+    F_0 = Sound('F#', 'F_0', 1.0)
+    G0 = Sound('G', 'G0', 1.0)
+    Ab0 = Sound('Ab', 'Ab0', 1.0)
+    A0 = Sound('A', 'A0', 1.0)
+    Bb0 = Sound('Bb', 'Bb0', 1.0)
+    B0 = Sound('B', 'B0', 1.0)
+    C1 = Sound('C', 'C1', 1.0)
+    Db1 = Sound('Db', 'Db1', 1.0)
+    D1 = Sound('D', 'D1', 1.0)
+    Eb1 = Sound('Eb', 'Eb1', 1.0)
+    E1 = Sound('E', 'E1', 1.0)
+    F1 = Sound('F', 'F1', 1.0)
     melody_notes = [C0, Db0, D0, Eb0, E0, F0, F_0, G0, Ab0, A0, Bb0, B0, C1,
                     Db1, D1, Eb1, E1, F1]
 
-    for melody_note in melody_notes:
-        melody_note.sound.set_volume(1.0)
-
-    perc_deep = pygame.mixer.Sound('perc_deep.wav')
-    perc_mid = pygame.mixer.Sound('perc_mid.wav')
-    perc_high = pygame.mixer.Sound('perc_high.wav')
-    perc_deep.set_volume(0.5)
-    perc_mid.set_volume(1.0)
-    perc_high.set_volume(1.0)
+    perc_deep = Sound('perc_deep', 'perc_deep', 0.5)
+    perc_mid = Sound('perc_mid', 'perc_mid', 1.0)
+    perc_high = Sound('perc_high', 'perc_high', 1.0)
 
     pygame.draw.rect(screen, pygame.color.THECOLORS['tan'],
                      (0, 0, 800, 650))
@@ -1112,5 +1346,20 @@ if __name__ == '__main__':
     # Render the display
     render_display(screen)
 
+    # In measurement mode, CPU use is sampled by a timer
+    if MEASURE_UI:
+        meter = Meter()
+        pygame.time.set_timer(METER_EVENT, METER_MS)
+
     # Start an event loop to respond to events.
     event_loop(screen)
+
+    print('samples: {mapped} mapped, {derived} derived, {kept} kept, '
+          '{loads} loads, {hits} hits, {drops} dropped, {load_ms:.0f} ms '
+          'loading, {rss_mb:.0f} MB resident'.format(**bank.report()))
+    if MEASURE_UI:
+        meter.sample()
+        print('ui: {idle_cpu:.1f}% CPU over {idle_s:.0f} s idle, '
+              '{busy_cpu:.1f}% CPU with input, {notes} notes '
+              '{dispatch_ms:.1f} ms from dequeued key to sound (at most '
+              '{max_dispatch_ms:.1f} ms)'.format(**meter.report()))
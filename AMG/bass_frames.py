@@ -14,31 +14,47 @@ def construct_bass(curr_loop):
     @rtype: None
     """
 
+    for i in range(curr_loop.measures):
+        bass_measure(curr_loop, i)
+
+    finish_bass(curr_loop)
+
+
+def bass_measure(curr_loop, i):
+    """Writes the rhythm, ints, and notes of measure i of a Loop's (curr_loop) bass ~
+    The harmony rhythm and melody ints of measure i must already be written ~
+    This is a mutating function ~
+
+    @type curr_loop: Loop
+    @type i: int
+    @rtype: None
+    """
+
     # First filling the rhythm Frame
-    for i, curr_measure in enumerate(curr_loop.bass['rhythm'].measures):
-        bass_rhythm(curr_measure, curr_loop)
+    bass_rhythm(curr_loop.bass['rhythm'].measures[i], curr_loop)
 
     # Next filling the ints Frame
-    curr_loop.bass['ints'] = curr_loop.bass['rhythm'].extend().collapse(curr_loop)
-    for curr_measure in curr_loop.bass['ints'].measures:
-        bass_notes(curr_measure, curr_loop)
+    curr_measure = curr_loop.bass['ints'].measures[i]
+    for curr_note, rhythm_note in zip(curr_measure.notes, curr_loop.bass['rhythm'].measures[i].notes):
+        curr_note.value = rhythm_note.value
+    bass_notes(curr_measure, curr_loop)
 
     # Filling the notes Frame
-    curr_loop.bass['notes'] = curr_loop.melody['ints'].extend().collapse(curr_loop)
-    for curr_measure in curr_loop.bass['notes'].measures:
-        for curr_note in curr_measure.notes:
+    for curr_note, ints_note in zip(curr_loop.bass['notes'].measures[i].notes,
+                                    curr_loop.melody['ints'].measures[i].notes):
+        # new note / attack -> pitch class, where 0 is A
+        curr_chord = curr_loop.harm['passing'][curr_note.index].value['chord']
 
-            if curr_loop.bass['rhythm'][curr_note.index] == 'S':  # sustained note
-                curr_note.value = curr_note.prev.value
+        curr_note.value = (get_tonic(curr_loop.key) + ints_note.value + curr_chord.interval) % 12
 
-            else:  # new note / attack
-                curr_chord = curr_loop.harm['passing'][curr_note.index].value['chord']
 
-                tonic = key_sharp_or_flat(curr_loop.key).index(curr_loop.key['root'])
-                target = (tonic + curr_note.value + curr_chord.interval) % 12
+def finish_bass(curr_loop):
+    """Constructs the final compressed bass Frame of a Loop (curr_loop), once every measure is written ~
+    This is a mutating function ~
 
-                curr_note.value = chord_sharp_or_flat(curr_chord, curr_loop)[target]
+    @type curr_loop: Loop
+    @rtype: None
+    """
 
-    # Filling the final Frame
     curr_loop.bass['final'] = curr_loop.bass['notes'].extend().collapse(curr_loop)
     curr_loop.bass['final'].compress()
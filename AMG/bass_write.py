@@ -1,6 +1,5 @@
 """Assigns rhythm and notes to the bass ~ """
 
-import random
 from melody_notes import *
 
 
@@ -24,11 +23,11 @@ def bass_rhythm(curr_measure, curr_loop):
             curr_note.value = 'A'
 
         # Bass will probably attack spots marked 'salient' by rhythm_ref
-        elif curr_loop.rhythm_ref[i] == 1 and random.randint(0, 2) != 0:
+        elif curr_loop.rhythm_ref[i] == 1 and curr_loop.rng.randint(0, 2) != 0:
             curr_note.value = 'A'
 
         # Quarter notes have a chance of being attacked by bass
-        elif i % 2 == 0 and random.randint(0, 2) == 0:
+        elif i % 2 == 0 and curr_loop.rng.randint(0, 2) == 0:
             curr_note.value = 'A'
 
         # Everything else is sustain
@@ -53,8 +52,7 @@ def bass_notes(curr_measure, curr_loop):
             if curr_loop.harm['rhythm'][curr_note.index].value == 'A':
                 curr_note.value = 0
             else:
-                curr_note.value = random.choice(chord_scale['shell'] + chord_scale['shell'] + chord_scale['guide']
-                                                + chord_scale['color'])
+                curr_note.value = curr_loop.rng.choice(chord_scale['bass'])
 
         elif curr_note.value == 'S':
             curr_note.value = curr_note.prev.value
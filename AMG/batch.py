@@ -0,0 +1,166 @@
+"""Generates many Loops at once across processes, writing each as a MIDI file ~
+
+Run directly for the command line interface, e.g. python batch.py 1000 --intensity 2 --measures 8 --jobs 32; with
+--wav, an audio preview of each Loop is written beside its MIDI file ~
+"""
+
+from class_loop import *
+from loop_midi import loop_to_smf
+from midi_generation import save_midi
+from render_audio import render_loop, wav_bytes
+from melody_rhythm import build_rest_tables
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import argparse
+import os
+import time
+
+
+def loop_seeds(count, seed):
+    """Returns the seed of each of count Loops derived from one batch seed ~
+    Loop i always receives the same seed, regardless of how the batch is split across processes ~
+
+    @type count: int
+    @type seed: int
+    @rtype: list[int]
+    """
+
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+
+def write_chunk(chunk, intensity, measures, out_dir, audio=False):
+    """Writes and exports every Loop of a chunk; runs inside a worker process ~
+
+    @type chunk: list[(int, int)]
+        (index, seed) of each Loop
+    @type intensity: int
+    @type measures: int
+    @type out_dir: str
+    @type audio: bool
+        if True, each Loop is also rendered to a .wav file of the same name as its MIDI file
+    @rtype: list[(int, int, str)]
+        (index, seed, path) of each MIDI file written
+    """
+
+    results = []
+
+    for index, seed in chunk:
+        curr_loop = Loop(measures, intensity, seed=seed)
+        curr_loop.write_loop()
+
+        path = os.path.join(out_dir, '{:06d}_{:016x}.mid'.format(index, seed))
+        save_midi(loop_to_smf(curr_loop), path)
+        if audio:
+            save_midi(wav_bytes(render_loop(curr_loop)), path[:-len('.mid')] + '.wav')
+
+        results.append((index, seed, path))
+
+    return results
+
+
+def generate_many(count, intensity, measures, jobs=None, seed=None, out_dir='loops', chunk_size=16, progress=None,
+                  audio=False):
+    """Generates count Loops and writes each to out_dir as a MIDI file, as soon as it is finished ~
+
+    Loops are submitted to a pool of jobs worker processes in chunks of chunk_size, with at most two chunks per
+    worker in flight at once. Every process builds its lookup tables before writing its first Loop, such that no
+    Loop pays for them. Loop i is written with seed loop_seeds(count, seed)[i], so a batch is reproducible
+    for any number of jobs ~
+
+    @type count: int
+    @type intensity: int
+    @type measures: int
+    @type jobs: int | None
+        number of worker processes; defaults to the number of CPUs. With 1, Loops are written in this process
+    @type seed: int | None
+        if None, a batch seed is drawn from the global random module
+    @type out_dir: str
+    @type chunk_size: int
+    @type progress: callable | None
+        called as progress(done, count, elapsed) after every finished chunk
+    @type audio: bool
+        if True, an audio preview of each Loop is written beside its MIDI file; see write_chunk()
+    @rtype: list[(int, int, str)]
+        (index, seed, path) of every MIDI file written, ordered by index
+    """
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if seed is None:
+        seed = random.getrandbits(64)
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    specs = list(enumerate(loop_seeds(count, seed)))
+    chunks = [specs[i:i + chunk_size] for i in range(0, count, chunk_size)]
+
+    # Built before the pool starts, such that forked workers inherit the tables; spawned workers build their own
+    build_rest_tables()
+
+    results = []
+    start = time.perf_counter()
+
+    if jobs == 1:
+        for chunk in chunks:
+            results.extend(write_chunk(chunk, intensity, measures, out_dir, audio))
+            if progress is not None:
+                progress(len(results), count, time.perf_counter() - start)
+
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=build_rest_tables) as executor:
+        pending = set()
+        chunks = iter(chunks)
+
+        while True:
+            # Keeping the pool busy without queueing every chunk up front
+            for chunk in chunks:
+                pending.add(executor.submit(write_chunk, chunk, intensity, measures, out_dir, audio))
+                if len(pending) >= 2 * jobs:
+                    break
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results.extend(future.result())
+                if progress is not None:
+                    progress(len(results), count, time.perf_counter() - start)
+
+    results.sort()
+    return results
+
+
+def print_progress(done, count, elapsed):
+    """Prints how many Loops have been written, and at what rate ~
+
+    @type done: int
+    @type count: int
+    @type elapsed: float
+    @rtype: None
+    """
+
+    print('{}/{} loops, {:.1f} loops/sec'.format(done, count, done / elapsed if elapsed else 0.0))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a library of Amadeus loops as MIDI files.')
+    parser.add_argument('count', type=int, help='number of loops to generate')
+    parser.add_argument('--intensity', type=int, default=2, choices=range(5), help='0 (very chill) to 4 (very intense)')
+    parser.add_argument('--measures', type=int, default=8, help='measures per loop')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: number of CPUs)')
+    parser.add_argument('--seed', type=int, default=None, help='batch seed, for reproducible libraries')
+    parser.add_argument('--out', default='loops', help='output directory')
+    parser.add_argument('--chunk-size', type=int, default=16, help='loops per task sent to a worker')
+    parser.add_argument('--wav', action='store_true', help='also render each loop to a .wav audio preview')
+    args = parser.parse_args()
+
+    batch_start = time.perf_counter()
+    written = generate_many(args.count, args.intensity, args.measures, jobs=args.jobs, seed=args.seed,
+                            out_dir=args.out, chunk_size=args.chunk_size, progress=print_progress,
+                            audio=args.wav)
+    batch_time = time.perf_counter() - batch_start
+
+    print('wrote {} loops to {} in {:.2f}s ({:.1f} loops/sec)'.format(len(written), args.out, batch_time,
+                                                                     len(written) / batch_time))
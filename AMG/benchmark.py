@@ -0,0 +1,193 @@
+"""Times the hot paths of writing a Loop, how writing a Song scales, and how fast Loops render to audio ~
+
+Run directly to print the average cost of each melody and bass note, of each measure of a Song, and the speed of
+rendering audio ~
+"""
+
+from class_song import *
+from render_audio import render_loop, SAMPLE_RATE
+from melody_rhythm import build_rest_tables
+from class_scheduler import Scheduler
+import threading
+import time
+
+
+def note_cost(count, measures, intensity):
+    """Writes count Loops, then returns the average microseconds spent choosing each melody and bass note ~
+    Only melody_notes() and bass_notes() are timed, over the whole of each Loop's 'ints' Frames ~
+
+    @type count: int
+    @type measures: int
+    @type intensity: int
+    @rtype: (float, float)
+        (melody, bass) microseconds per note
+    """
+
+    melody_time = bass_time = 0.0
+    notes = 0
+
+    for i in range(count):
+        curr_loop = Loop(measures, intensity, seed=i)
+        curr_loop.write_loop()
+
+        melody_ints = curr_loop.melody['rhythm'].extend().collapse(curr_loop)
+        start = time.perf_counter()
+        for curr_measure in melody_ints.measures:
+            melody_notes(curr_measure, curr_loop)
+        melody_time += time.perf_counter() - start
+
+        bass_ints = curr_loop.bass['rhythm'].extend().collapse(curr_loop)
+        start = time.perf_counter()
+        for curr_measure in bass_ints.measures:
+            bass_notes(curr_measure, curr_loop)
+        bass_time += time.perf_counter() - start
+
+        notes += len(melody_ints.notes)
+
+    return melody_time / notes * 1e6, bass_time / notes * 1e6
+
+
+def song_cost(measures, intensity, count=3):
+    """Writes count Songs of some measures, and returns the average microseconds spent on each measure ~
+
+    @type measures: int
+    @type intensity: int
+    @type count: int
+    @rtype: float
+    """
+
+    start = time.perf_counter()
+
+    for i in range(count):
+        curr_song = Song(measures, intensity, seed=i)
+        curr_song.write_song()
+
+    return (time.perf_counter() - start) / (count * measures) * 1e6
+
+
+def check_song_scaling(lengths=(64, 128, 256, 512, 1024), intensity=2, tolerance=1.5, reference=256):
+    """Asserts that the time per measure of writing a Song stays flat as Songs grow ~
+
+    Shorter Songs cost more per measure, as writing their themes is a fixed cost which dominates below some hundreds
+    of measures; they are timed and returned, but only lengths from reference up are compared, such that a cost
+    growing with the length of the Song is not hidden behind the fixed cost ~
+
+    @type lengths: tuple(int)
+        in increasing order
+    @type intensity: int
+    @type tolerance: float
+        the most any longer length may cost per measure, as a multiple of the cost of reference
+    @type reference: int
+        one of lengths
+    @rtype: dict{int: float}
+        microseconds per measure of each length
+    """
+
+    build_rest_tables()
+    song_cost(reference, intensity, 1)  # building the other lookup tables on first use is not counted
+
+    costs = {}
+    for measures in lengths:
+        costs[measures] = song_cost(measures, intensity)
+
+    for measures in lengths:
+        if measures > reference:
+            assert costs[measures] <= tolerance * costs[reference], 'time per measure is not flat: {}'.format(costs)
+
+    return costs
+
+
+def write_times(count, measures, intensity):
+    """Writes count Loops after building every rest table, and returns the median, 99th percentile, and longest
+    milliseconds spent writing one ~
+    No Loop waits on a table; the remaining tail is the collector freeing earlier Loops, whose Notes link into cycles ~
+
+    @type count: int
+    @type measures: int
+    @type intensity: int
+    @rtype: (float, float, float)
+    """
+
+    build_rest_tables()
+
+    times = []
+    for i in range(count):
+        start = time.perf_counter()
+        curr_loop = Loop(measures, intensity, seed=i)
+        curr_loop.write_loop()
+        times.append((time.perf_counter() - start) * 1e3)
+
+    times.sort()
+    return times[count // 2], times[int(0.99 * (count - 1))], times[-1]
+
+
+def render_speed(count, measures, intensity):
+    """Renders count written Loops to audio, and returns how many times faster than real time they were rendered ~
+    Samples are loaded before timing starts ~
+
+    @type count: int
+    @type measures: int
+    @type intensity: int
+    @rtype: float
+    """
+
+    loops = []
+    for i in range(count):
+        curr_loop = Loop(measures, intensity, seed=i)
+        curr_loop.write_loop()
+        loops.append(curr_loop)
+
+    render_loop(loops[0])
+
+    audio = 0.0
+    start = time.perf_counter()
+    for curr_loop in loops:
+        audio += len(render_loop(curr_loop)) / SAMPLE_RATE
+
+    return audio / (time.perf_counter() - start)
+
+
+def dispatch_lateness(count, interval=0.005):
+    """Dispatches count empty events, interval seconds apart, beside a thread which holds the GIL whenever it can,
+    and returns the Scheduler's report; see Scheduler.report() ~
+    The longest lateness also counts time the operating system gives to other processes, and varies between runs ~
+
+    @type count: int
+    @type interval: float
+    @rtype: dict{str: int | float}
+    """
+
+    stopped = threading.Event()
+
+    def busy():
+        while not stopped.is_set():
+            sum(range(1000))
+
+    thread = threading.Thread(target=busy, daemon=True)
+    thread.start()
+
+    scheduler = Scheduler([(i * interval, lambda: None, ()) for i in range(count)])
+    scheduler.start()
+    scheduler.thread.join()
+
+    stopped.set()
+    thread.join()
+
+    return scheduler.report()
+
+
+if __name__ == '__main__':
+    for length in [2, 4, 8]:
+        print('{} measures: {:.2f}us per melody note, {:.2f}us per bass note'.format(length,
+                                                                                    *note_cost(200, length, 2)))
+
+    print('8-measure Loops: {:.1f}ms median, {:.1f}ms 99th percentile, {:.1f}ms longest write'.format(
+        *write_times(300, 8, 2)))
+
+    for length, cost in check_song_scaling().items():
+        print('{}-measure Song: {:.0f}us per measure'.format(length, cost))
+
+    print('8-measure Loops render {:.0f}x faster than real time'.format(render_speed(20, 8, 2)))
+
+    print('Scheduler beside a busy thread: {mean_ms:.2f}ms mean, {p99_ms:.2f}ms 99th percentile, {max_ms:.2f}ms '
+          'latest event'.format(**dispatch_lateness(2000)))
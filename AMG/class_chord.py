@@ -4,6 +4,9 @@
 class Chord:
     """Represents a chord ~
 
+    Chords are immutable and interned: constructing a Chord with the same name, quality and interval as an existing
+    Chord returns that same object ~
+
     === Attributes ===
     @type name: str
     @type quality: str
@@ -12,16 +15,47 @@ class Chord:
         the distance (in semi-tones) between this chord's root and the tonic
     """
 
-    def __init__(self, name, quality, interval):
-        """Constructs a Chord ~
+    __slots__ = ('name', 'quality', 'interval')
+    _interned = {}
 
-        @type self: Chord
+    def __new__(cls, name, quality, interval):
+        """Constructs a Chord, or returns the existing Chord with these attributes ~
+
+        @type cls: type
         @type name: str
         @type quality: str
         @type interval: int
+        @rtype: Chord
+        """
+
+        key = (name, quality, interval)
+        chord = cls._interned.get(key)
+
+        if chord is None:
+            chord = object.__new__(cls)
+            object.__setattr__(chord, 'name', name)
+            object.__setattr__(chord, 'quality', quality)
+            object.__setattr__(chord, 'interval', interval)
+            cls._interned[key] = chord
+
+        return chord
+
+    def __setattr__(self, name, value):
+        """Chords are immutable ~
+
+        @type self: Chord
+        @type name: str
+        @type value: object
         @rtype: None
         """
 
-        self.name = name
-        self.quality = quality
-        self.interval = interval
+        raise AttributeError('Chord objects are immutable')
+
+    def __reduce__(self):
+        """Pickles a Chord by its attributes, such that unpickling returns the interned Chord ~
+
+        @type self: Chord
+        @rtype: (type, (str, str, int))
+        """
+
+        return Chord, (self.name, self.quality, self.interval)
@@ -15,6 +15,8 @@ class Family:
     @type weight: int
     """
 
+    __slots__ = ('name', 'chords', 'tritone', 'weight')
+
     def __init__(self, name, chords, tritone):
         """Constructs a chord family ~
 
@@ -39,34 +41,48 @@ class Family:
         @rtype: None
         """
 
+        self.weight = self.get_weight(curr_loop.key['quality'], curr_loop.attributes['tritone'])
+
+    def get_weight(self, key_quality, tritone):
+        """Returns the weight of family self for a key quality and tritone rating, without mutating self ~
+
+        @type self: Family
+        @type key_quality: str
+            either 'major' or 'minor'
+        @type tritone: int
+        @rtype: int
+        """
+
         # Arbitrary general formula found through trial and error; though effective, this can probably be improved
-        self.weight = int(15 - ((self.tritone - curr_loop.attributes['tritone']) ** 2 * 2.5))
+        weight = int(15 - ((self.tritone - tritone) ** 2 * 2.5))
 
         # Accounting for exceptional chords
-        if curr_loop.key['quality'] == 'major':
+        if key_quality == 'major':
 
             # Diatonic chords e.g. I, IV, II- will occur occasionally in high tritone loops, rather than never
             if self.name == 'primary_dominant' or self.name == 'diatonic major' or self.name == 'diatonic minor':
-                if curr_loop.attributes['tritone'] > 2:
-                    self.weight = 2
+                if tritone > 2:
+                    weight = 2
 
             # V7 and bVII7 -> if tritone rating is: (0-1) -> never occur; (2-4) -> occur sporadically
             if self.name == 'mi_dominant' or self.name == 'primary_dominant':
-                if curr_loop.attributes['tritone'] < 2:
-                    self.weight = 0
-                else:  # curr_loop.attributes['tension'] > 2
-                    self.weight = 2
+                if tritone < 2:
+                    weight = 0
+                else:  # tritone > 2
+                    weight = 2
 
             # V7/bII and V7/bVI will occur rarely in major keys
             if self.name == 'mi_sec_dom':
-                self.weight = 1
+                weight = 1
 
-        else:  # loop.key['quality'] == 'minor'
+        else:  # key_quality == 'minor'
 
             # Diatonic chords e.g. I-, IV-, bIII will occur occasionally in high tritone loops, rather than never
             if self.name == 'mi_minor' or self.name == 'mi_major':
-                self.weight = 2
+                weight = 2
 
             # Chord diatonic to major key will occur rarely
             if self.name == 'diatonic major' or self.name == 'diatonic minor' or self.name == 'ma_sec_dom':
-                self.weight = 1
+                weight = 1
+
+        return weight
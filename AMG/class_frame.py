@@ -9,11 +9,23 @@ class Frame:
     === Attributes ===
     @type length: int
     @type measures: list[Measure]
+    @type notes: list[Note]
+        every Note of measures, in order; indexed by Note.index in decompressed Frames
+    @type prev_attacks: list[int | None] | None
+        for rhythm Frames, the index of the last attack before each step (None if there is none); see index_rhythm()
+    @type next_events: list[str | None] | None
+        for rhythm Frames, whether the next step after each which is not a sustain is an attack ('A') or a rest ('R'),
+        or None at the end of the Frame; see index_rhythm()
     """
 
+    __slots__ = ('length', 'measures', 'notes', 'prev_attacks', 'next_events')
+
     def __init__(self, length):
         """Constructs an empty Frame comprised of empty Measures ~
 
+        The Notes of every Measure are also kept in one flat, step-ordered list (notes), such that indexing a
+        Frame is O(1); Frame.measures is a view over the same Note objects ~
+
         @type self: Frame
         @type length: int
         @rtype: None
@@ -21,36 +33,27 @@ class Frame:
 
         self.length = length
         self.measures = []
-        counter = 0
+        self.notes = []
+        self.prev_attacks = None
+        self.next_events = None
 
         prev_measure = None
-        curr_measure = Measure(8, counter)
-        next_measure = Measure(8, counter+8)
-        # 8 means 1/8 notes; this will be upgraded to apply to variable divisions of a measure
 
-        for _ in range(length):
-            counter += 8
+        for i in range(length):
+            curr_measure = Measure(8, 8*i)
+            # 8 means 1/8 notes; this will be upgraded to apply to variable divisions of a measure
 
+            # Linking measures, and notes at the end/start of adjacent measures
             curr_measure.prev = prev_measure
-            curr_measure.next = next_measure
+            if prev_measure is not None:
+                prev_measure.next = curr_measure
+                prev_measure.notes[-1].next = curr_measure.notes[0]
+                curr_measure.notes[0].prev = prev_measure.notes[-1]
 
             self.measures.append(curr_measure)
+            self.notes.extend(curr_measure.notes)
 
             prev_measure = curr_measure
-            curr_measure = next_measure
-            next_measure = Measure(8, counter+8)
-
-        if prev_measure is not None:
-            prev_measure.next = None
-
-        # Linking notes at the end/start of measures
-        for curr_measure in self.measures:
-            for curr_note in curr_measure.notes:
-                if (curr_note.index+1) % length == 0 and curr_note.index+1 != 8*length:
-                    end_note = curr_note
-                if curr_note.index % length == 0 and curr_note.index != 0:
-                    curr_note.prev = end_note
-                    end_note.next = curr_note
 
     def __str__(self):
         """Prints the values of a Frame
@@ -75,14 +78,13 @@ class Frame:
         @rtype: Frame
         """
 
-        new_frame = Frame(1)
-        new_notes = []
-
-        for curr_measure in self.measures:
-            new_notes.extend(curr_measure.notes)
+        new_frame = Frame(0)
+        new_frame.length = 1
+        new_frame.notes = list(self.notes)
 
-        new_frame.measures = [Measure(0, self.length)]
-        new_frame.measures[0].notes = new_notes
+        new_measure = Measure(0, self.length)
+        new_measure.notes = new_frame.notes
+        new_frame.measures = [new_measure]
 
         return new_frame
 
@@ -95,24 +97,64 @@ class Frame:
         """
 
         new_frame = Frame(curr_loop.measures)
-        counter = 0
 
-        for curr_measure in new_frame.measures:
-            for curr_note in curr_measure.notes:
-                curr_note.value = self.measures[0].notes[counter].value
-                counter += 1
+        for curr_note, old_note in zip(new_frame.notes, self.notes):
+            curr_note.value = old_note.value
 
         return new_frame
 
+    def index_rhythm(self, start=0, stop=None):
+        """Records the last attack before, and the next event after, every step of a finished rhythm Frame (self) ~
+        This is a mutating function; it must be called again if the Frame's values change ~
+
+        Both are found in one pass each, such that looking either up while writing notes is O(1). Steps may be
+        indexed a range at a time, in order, once every step before stop (and the step at stop) is finished ~
+
+        @type self: Frame
+        @type start: int
+        @type stop: int | None
+            if None, every step from start to the end of the Frame is indexed
+        @rtype: None
+        """
+
+        if stop is None:
+            stop = len(self.notes)
+
+        if start == 0:
+            self.prev_attacks = [None] * len(self.notes)
+            self.next_events = [None] * len(self.notes)
+            prev_attack = None
+        elif self.notes[start - 1].value == 'A':
+            prev_attack = start - 1
+        else:
+            prev_attack = self.prev_attacks[start - 1]
+
+        for i in range(start, stop):
+            self.prev_attacks[i] = prev_attack
+            if self.notes[i].value == 'A':
+                prev_attack = i
+
+        next_event = None
+        for i in range(stop, len(self.notes)):
+            if self.notes[i].value != 'S':
+                next_event = self.notes[i].value
+                break
+
+        for i in range(stop - 1, start - 1, -1):
+            self.next_events[i] = next_event
+            if self.notes[i].value != 'S':
+                next_event = self.notes[i].value
+
     def __getitem__(self, index):
         """Returns the Note at the specified index of (extended form of) a Frame (self) ~
+        A slice returns the list of Notes in that range, e.g. frame[8:16] for the second measure ~
 
         @type self: Frame
-        @type index: int
-        @rtype: Note
+        @type index: int | slice
+        @rtype: Note | list[Note]
         """
 
-        return self.extend().measures[0].notes[index]
+        return self.notes[index]
 
     def compress(self):
         """Returns a new Frame whose adjacent notes of equivalent value have been combined ~
@@ -169,6 +211,10 @@ class Frame:
             final_measure.notes = new_measure
             new_frame.measures[i] = final_measure
 
+        # self and new_frame share their measures, so both flat views are rebuilt
+        new_frame.notes = [curr_note for curr_measure in new_frame.measures for curr_note in curr_measure.notes]
+        self.notes = new_frame.notes
+
         return new_frame
 
 
@@ -0,0 +1,172 @@
+"""Contains class KeyContext, which answers key-dependent questions about chords and notes by lookup ~
+
+KeyContexts are built once per key and cached; get them with get_key_context() ~
+"""
+
+from harmony_objects import *
+
+# (root, quality) -> KeyContext; each is built on first use, so there are at most 24 (plus enharmonic spellings)
+key_contexts = {}
+
+enharmonics = {'Ab': 'G#', 'Bb': 'A#', 'Db': 'C#', 'Eb': 'D#', 'Gb': 'F#',
+               'A#': 'Bb', 'C#': 'Db', 'D#': 'Eb', 'F#': 'Gb', 'G#': 'Ab'}
+
+
+def get_key_context(curr_key):
+    """Returns the KeyContext of a key, building it on first use ~
+
+    @type curr_key: dict{'root': str, 'quality': str}
+    @rtype: KeyContext
+    """
+
+    context = key_contexts.get((curr_key['root'], curr_key['quality']))
+
+    if context is None:
+        context = KeyContext(curr_key['root'], curr_key['quality'])
+        key_contexts[(curr_key['root'], curr_key['quality'])] = context
+
+    return context
+
+
+def key_sharp_or_flat(curr_key):
+    """Takes a key and returns whether it has sharps or flats
+
+    @type curr_key: (str, str)
+        e.g. ('A', 'major')
+    @rtype: str
+        either 's' for sharp or 'f' for flat
+    """
+
+    if curr_key['quality'] == 'major':
+        if curr_key['root'] in ['C', 'D', 'E', 'G', 'A', 'B', 'C#', 'D#', 'F#', 'G#', 'A#']:
+            return notes_sharp
+        else:  # curr_key['root'] in notes not listed above (including enharmonic spellings)
+            return notes_flat
+    else:  # curr_key['quality'] == 'minor'
+        if curr_key['root'] in ['E', 'B', 'F#', 'C#', 'G#', 'D#', 'A#']:
+            return notes_sharp
+        else:  # curr_key['root'] not in notes listed above (including enharmonic spellings)
+            return notes_flat
+
+
+class KeyContext:
+    """Represents a key, together with lookup tables for the chords heard in it ~
+
+    Chord spellings and names are worked out the first time a chord is asked about, then looked up ~
+
+    === Attributes ===
+    @type key: dict{'root': str, 'quality': str}
+    @type notes: list[str]
+        either notes_sharp or notes_flat, whichever the key is spelled with
+    @type tonic: int
+        pitch class of the key's root, where 0 is A
+    @type diatonic_chords: frozenset(Chord)
+    @type chord_notes: dict{Chord: list[str]}
+        either notes_sharp or notes_flat, whichever each chord is spelled with
+    @type chord_names: dict{Chord: str}
+    """
+
+    __slots__ = ('key', 'notes', 'tonic', 'diatonic_chords', 'chord_notes', 'chord_names')
+
+    def __init__(self, root, quality):
+        """Constructs the KeyContext of a key ~
+
+        @type self: KeyContext
+        @type root: str
+            e.g. 'Ab'
+        @type quality: str
+            either 'major' or 'minor'
+        @rtype: None
+        """
+
+        self.key = {'root': root, 'quality': quality}
+        self.notes = key_sharp_or_flat(self.key)
+
+        if root in notes_flat:
+            self.tonic = notes_flat.index(root)
+        else:  # root is spelled with a sharp
+            self.tonic = notes_sharp.index(root)
+
+        if quality == 'major':
+            diatonic_families = [diatonic_major, diatonic_minor, primary_dominant, ma_sec_dom]
+        else:  # quality == 'minor'
+            diatonic_families = [mi_major, mi_minor, mi_dominant, mi_sec_dom]
+
+        self.diatonic_chords = frozenset(temp_chord for temp_family in diatonic_families
+                                         for temp_chord in temp_family.chords)
+
+        self.chord_notes = {}
+        self.chord_names = {}
+
+    def get_chord_name(self, curr_chord):
+        """Returns the name of the chord according to its relation to the tonic ~
+
+        @type self: KeyContext
+        @type curr_chord: Chord
+        @rtype: str
+        """
+
+        name = self.chord_names.get(curr_chord)
+
+        if name is None:
+            interval = (self.tonic + curr_chord.interval) % 12
+
+            if curr_chord in self.diatonic_chords:
+                # Chord is diatonic; # or b will be the same as the key
+                root = self.notes[interval]
+
+            else:
+                # Chord is not diatonic; if key is major, Chord is b; if minor, Chord is #; this pattern may not be
+                # 100% precise or complete, however it is applicable to the vast majority of cases
+                if self.key['quality'] == 'major':
+                    root = notes_flat[interval]
+                else:
+                    root = notes_sharp[interval]
+
+            quality = curr_chord.quality
+            if quality == 'dominant':
+                quality = '7'
+            elif quality == 'major':
+                quality = 'maj'
+            else:  # quality == 'minor'
+                quality = '-'
+
+            if curr_chord.name in ['relII-7b5', 'II-7b5']:
+                quality += '7b5'
+
+            name = root + quality
+            self.chord_names[curr_chord] = name
+
+        return name
+
+    def get_chord_notes(self, curr_chord):
+        """Returns whether a chord should be labelled with notes that are sharp or flat ~
+
+        @type self: KeyContext
+        @type curr_chord: Chord
+        @rtype: list[str]
+            either notes_sharp or notes_flat
+        """
+
+        chosen_notes = self.chord_notes.get(curr_chord)
+
+        if chosen_notes is None:
+            if curr_chord in self.diatonic_chords:
+                chosen_notes = self.notes
+            else:
+                if curr_chord.quality == 'dominant':
+                    quality = 'major'
+                else:
+                    quality = curr_chord.quality
+
+                name = self.get_chord_name(curr_chord)
+                if name[1] == 'b' or name[1] == '#':
+                    root = name[:2]
+                else:
+                    root = name[0]
+
+                chosen_notes = key_sharp_or_flat({'root': root, 'quality': quality})
+
+            self.chord_notes[curr_chord] = chosen_notes
+
+        return chosen_notes
@@ -5,8 +5,17 @@ from melody_frames import *
 from bass_frames import *
 from perc_frames import *
 from class_frame import *
+from class_timeline import *
 import random
 
+# Every key a Loop may be written in; major keys are spelled with flats and minor keys with sharps
+loop_keys = tuple([(root, 'major') for root in notes_flat if root != 'Gb'] +
+                  [(root, 'minor') for root in notes_sharp if root not in ['A#', 'D#']])
+
+# Cumulative chance of the next rhythm_ref hit landing 0, 1, ..., 7 spots after the previous try, when every try
+# hits with chance 1/101
+rhythm_gaps = tuple(1 - (100 / 101) ** (gap + 1) for gap in range(8))
+
 
 class Loop:
     """Represents one loop, which is comprised of a shitload of Frame objects ~
@@ -25,21 +34,36 @@ class Loop:
         e.g. [1, 0, 0, 1, 0, 0, 1, 0], where 1's are salient and 0's are not; ref is short for reference
 
     @type measures: int
+    @type seed: int
+        a Loop is fully determined by (measures, intensity, seed)
+    @type rng: random.Random
+        the Loop's own random number generator, used by every stage of write_loop()
     @type key: dict{'root': str (e.g. 'Ab'), 'quality': str (e.g. 'major')}
     @type attributes: dict{attribute str: value int}
         contains variables for compositional variety, e.g. conjunct/disjunct melody, deep/shallow harmony,
         degree of activity of bassline/percussion, etc.
     """
 
-    def __init__(self, measures, intensity):
+    def __init__(self, measures, intensity, seed=None):
         """Constructs an empty Loop ~
+        If no seed is given, one is drawn from the global random module and kept in self.seed for replaying ~
+
+        Every measure of every Frame is allocated here, as the writing functions look ahead to later measures; this
+        takes time linear in measures (about 1 ms at 8 measures, 35 ms at 256, and 300 ms at 1024) ~
 
         @type self: Loop
         @type measures: int
+        @type intensity: int
+        @type seed: int | None
         @rtype: None
         """
+        if seed is None:
+            seed = random.getrandbits(64)
+
         # Assigning fundamental/invariable attributes
         self.measures = measures
+        self.seed = seed
+        self.rng = random.Random(seed)
         self.key = None
         self.attributes = {}
         self.rhythm_ref = None
@@ -59,24 +83,14 @@ class Loop:
 
     def write_key(self):
         """Chooses a random key for a Loop (self) ~
+        Every key of loop_keys is equally likely ~
 
         @type self: Loop
         @rtype: None
         """
 
-        key = None
-        onward = False
-        while not onward:
-            if random.randint(0, 1) == 0:  # flat key
-                key = {'root': notes_flat[random.randint(0, 11)], 'quality': 'major'}
-                if key['root'] != 'Gb':
-                    onward = True
-            else:  # sharp key
-                key = {'root': notes_sharp[random.randint(0, 11)], 'quality': 'minor'}
-                if key['root'] != 'A#' and key['root'] != 'D#':
-                    onward = True
-
-        self.key = key
+        root, quality = self.rng.choice(loop_keys)
+        self.key = {'root': root, 'quality': quality}
 
     def write_attributes(self, intensity):
         """Takes a Loop (self) and an intensity rating, and writes its attributes parameter ~
@@ -87,8 +101,8 @@ class Loop:
         @rtype: None
         """
 
-        self.attributes['depth'] = intensity + random.randint(-1, 1)
-        self.attributes['tritone'] = intensity + random.randint(-1, 1)
+        self.attributes['depth'] = intensity + self.rng.randint(-1, 1)
+        self.attributes['tritone'] = intensity + self.rng.randint(-1, 1)
 
         for attribute in self.attributes:
             if self.attributes[attribute] == 5:
@@ -102,38 +116,166 @@ class Loop:
         This is a mutating function ~
         It is necessary to construct rhythm reference and harmony *before* melody, bass, and percussion ~
 
+        The Loop is written exactly as iter_measures() streams it ~
+
         @type self: Loop
         @rtype: None
         """
 
+        for _ in self.iter_measures():
+            pass
+
+    def iter_measures(self):
+        """Takes an empty Loop (self) and writes it one measure at a time, yielding each measure once it is written ~
+        This is a mutating function; the Loop's final Frames are constructed once the last measure is yielded ~
+
+        Measure i is yielded once the shell chord and melody rhythm of measure i+1 are written, as the passing
+        chords of measure i lead into the next shell chord, and melody notes before a rest avoid color tones ~
+
+        The first measure cannot be yielded before the whole Loop is allocated (see __init__()), such that the wait
+        for it grows with the Loop's length; live players should instead stream short Loops one after another with
+        stream_loop(intensity, measures=None), whose first measure is as quick as that of an 8-measure Loop ~
+
+        @type self: Loop
+        @rtype: generator(dict)
+            see measure_values()
+        """
+
         self.create_rhythm_ref()
-        construct_harmony(self)
 
-        construct_melody(self)
-        construct_bass(self)
-        construct_percussion(self)
+        for i in range(self.measures + 1):
+            if i < self.measures:
+                shell_measure(self, i)
+                melody_measure_rhythm(self, i)
+
+            if i > 0:
+                passing_chords(self.harm['passing'].measures[i-1], self)
+                harmony_rhythm(self, i-1)
+                melody_measure_notes(self, i-1)
+                bass_measure(self, i-1)
+                percussion_measure(self, i-1)
+
+                yield self.measure_values(i-1)
+
+        finish_harmony(self)
+        finish_melody(self)
+        finish_bass(self)
+
+    def measure_values(self, i):
+        """Returns the values of every step of a written measure i of a Loop (self) ~
+
+        @type self: Loop
+        @type i: int
+        @rtype: dict
+            'index': i
+            'harm': list[dict{'chord': Chord, 'voicing': tuple[int]}]
+            'melody': list[int | None]
+                pitch classes where 0 is A, or None for a rest
+            'bass': list[int]
+            'perc': dict{str: list[str]}
+                for each of 'kick', 'snare', 'closed_hat', 'open_hat': the instrument, or 'rest', at each step
+        """
+
+        return {'index': i,
+                'harm': [curr_note.value for curr_note in self.harm['passing'].measures[i].notes],
+                'melody': [curr_note.value for curr_note in self.melody['notes'].measures[i].notes],
+                'bass': [curr_note.value for curr_note in self.bass['notes'].measures[i].notes],
+                'perc': {instrument: [curr_note.value for curr_note in self.perc[instrument].measures[i].notes]
+                         for instrument in ['kick', 'snare', 'closed_hat', 'open_hat']}}
+
+    def to_events(self, voice_leading=False, registers=None):
+        """Returns every note event of a written Loop (self), of harmony, melody, bass, and each percussion Frame, as
+        one Timeline sorted by onset; every exporter reads a Loop through it ~
+
+        @type self: Loop
+        @type voice_leading: bool
+            see loop_timeline()
+        @type registers: dict{str: list[int] | int} | None
+            see loop_timeline()
+        @rtype: Timeline
+        """
+
+        return loop_timeline(self, voice_leading, registers)
+
+    def create_variation(self, seed):
+        """Returns a new Loop over the same harmony as a written Loop (self), with its own melody, bass, and perc ~
+        The key, attributes, rhythm_ref, and harm Frames are shared with self, not copied ~
+
+        @type self: Loop
+        @type seed: int
+        @rtype: Loop
+        """
+
+        variation = Loop(self.measures, 0, seed=seed)
+        variation.key = self.key
+        variation.attributes = self.attributes
+        variation.rhythm_ref = self.rhythm_ref
+        variation.harm = self.harm
+
+        construct_melody(variation)
+        construct_bass(variation)
+        construct_percussion(variation)
+
+        return variation
 
     def create_rhythm_ref(self):
         """Takes a Loop, empty or otherwise, and writes its rhythm_ref ~
         This is a mutating function ~
 
+        Hits are placed as if each spot were tried in turn, cycling through the measure, with a 1 in 101 chance of
+        a hit per try (a high number, to decrease bias toward the front of the list); the gap before each hit is
+        drawn directly rather than by trying spots one by one ~
+
         @type self: Loop
         @rtype: None
         """
 
         return_lst = [0, 0, 0, 0, 0, 0, 0, 0]
-        hits_total = random.choice([1, 2, 2, 3, 3, 3, 3, 3, 3, 4, 4])
-        hit_count = 0
-
-        while True:
-            for i, hit in enumerate(return_lst):
-                if hit_count == hits_total:
-                    self.rhythm_ref = return_lst
-                    return
-
-                if random.randint(0, 100) == 77:  # high number of 100 was chosen to decrease bias toward front of list
-                    return_lst[i] = 1
-                    hit_count += 1
+        hits_total = self.rng.choice([1, 2, 2, 3, 3, 3, 3, 3, 3, 4, 4])
+
+        # Each hit lands rhythm_gaps steps after the previous one (the first counting from index 0), wrapping around
+        # the measure; a hit may land on a spot that is already salient
+        i = -1
+        for _ in range(hits_total):
+            i = (i + 1 + self.rng.choices(range(8), cum_weights=rhythm_gaps)[0]) % 8
+            return_lst[i] = 1
+
+        self.rhythm_ref = return_lst
+
+
+def stream_loop(intensity, measures=None, seed=None, section_measures=8):
+    """Yields the measures of a Loop as they are written; see Loop.iter_measures() ~
+
+    If measures is None, the stream is endless: Loops of section_measures are written one after another in the key
+    of the first, and only the Loop being written is kept, such that the stream runs in constant memory, and the
+    wait for any measure is that of a section_measures Loop, however long the stream runs ~
+
+    @type intensity: int
+    @type measures: int | None
+    @type seed: int | None
+    @type section_measures: int
+    @rtype: generator(dict)
+        see Loop.measure_values(); 'index' counts measures from the start of the stream
+    """
+
+    if measures is not None:
+        yield from Loop(measures, intensity, seed=seed).iter_measures()
+        return
+
+    rng = random.Random(seed)
+    key = None
+    index = 0
+
+    while True:
+        curr_loop = Loop(section_measures, intensity, seed=rng.getrandbits(64))
+        if key is None:
+            key = curr_loop.key
+        curr_loop.key = key
+
+        for curr_values in curr_loop.iter_measures():
+            curr_values['index'] = index
+            index += 1
+            yield curr_values
 
 
 if __name__ == '__main__':
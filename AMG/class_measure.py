@@ -1,7 +1,6 @@
 """Contains Measure class, which is comprised of Notes"""
 
 from class_note import *
-import random
 
 
 class Measure:
@@ -14,6 +13,8 @@ class Measure:
     @type next: Measure | None
     """
 
+    __slots__ = ('length', 'notes', 'prev', 'next')
+
     def __init__(self, length, index):
         """Constructs an empty Measure of Notes with attribute (value -> None) ~
 
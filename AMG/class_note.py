@@ -14,6 +14,8 @@ class Note:
     @type next: Note | None
     """
 
+    __slots__ = ('value', 'length', 'index', 'prev', 'next')
+
     def __init__(self, value, length, index, prev=None, next_note=None):
         """Constructs a Note; prev and next attributes are by default EMPTY ~
 
@@ -0,0 +1,320 @@
+"""Contains class SampleBank, which memory-maps .wav samples and decodes each into a pygame Sound on first use ~
+
+Most pitches of each instrument are not recorded, but derived from a few anchor recordings by resampling ~
+"""
+
+from collections import OrderedDict
+import numpy as np
+import time
+import os
+
+# Samples of each instrument in ascending semi-tones: harmony from G3, bass from Eb1, melody from C5
+instrument_samples = {
+    'harm': ('G', 'Ab', 'A', 'Bb', 'B', 'C', 'Db', 'D', 'Eb', 'E', 'F', 'F_'),
+    'bass': ('bassEb', 'bassE', 'bassF', 'bassF_', 'bassG', 'bassAb', 'bassA', 'bassBb', 'bassB', 'bassC', 'bassDb',
+             'bassD'),
+    'melody': ('C0', 'Db0', 'D0', 'Eb0', 'E0', 'F0', 'F_0', 'G0', 'Ab0', 'A0', 'Bb0', 'B0', 'C1', 'Db1', 'D1', 'Eb1',
+               'E1', 'F1')}
+
+# The only recordings of each instrument; every other sample is derived from one, none more than two semi-tones away
+anchor_samples = {'harm': ('Ab', 'C', 'E'), 'bass': ('bassE', 'bassAb', 'bassC'),
+                  'melody': ('Db0', 'F0', 'A0', 'Db1', 'F1')}
+
+
+def nearest_anchors():
+    """Returns every sample which is not an anchor, as (its nearest anchor, semi-tones above that anchor) ~
+
+    @rtype: dict{str: (str, int)}
+    """
+
+    derived = {}
+
+    for instrument, names in instrument_samples.items():
+        anchors = [names.index(anchor) for anchor in anchor_samples[instrument]]
+        for i, name in enumerate(names):
+            if i not in anchors:
+                nearest = min(anchors, key=lambda anchor: abs(i - anchor))
+                derived[name] = (names[nearest], i - nearest)
+
+    return derived
+
+
+# Every sample which is derived rather than recorded; see nearest_anchors()
+derived_samples = nearest_anchors()
+
+
+class SampleBank:
+    """Represents a directory of 16-bit .wav samples ~
+
+    A sample's file is only memory-mapped, not read, until its Sound is first asked for; at most capacity Sounds are
+    kept, and the least recently used Sound which is not playing is dropped first ~
+
+    Every sample of derived_samples is resampled from its anchor's recording when it is asked for, and its 16-bit
+    frames are kept for at most derived_capacity samples, least recently used first; a sample dropped from them is
+    derived again if it is asked for again ~
+
+    === Attributes ===
+    @type directory: str
+    @type capacity: int
+    @type derived_capacity: int
+    @type frames: dict{str: np.memmap}
+        the frames of every recording mapped so far, of shape (frames, channels), by name
+    @type rates: dict{str: int}
+        the frame rate of every sample mapped or derived so far, by name
+    @type derived_frames: OrderedDict{str: np.ndarray}
+        the 16-bit frames of the derived samples kept, least recently used first
+    @type sounds: OrderedDict{str: pygame.mixer.Sound}
+        the Sounds kept, least recently used first
+    @type loads: int
+        Sounds created, including any created again after being dropped
+    @type hits: int
+        Sounds asked for which were already kept
+    @type drops: int
+    @type derived: int
+        samples derived from an anchor so far, including any derived again
+    @type load_time: float
+        seconds spent mapping and deriving samples, and creating Sounds
+    """
+
+    def __init__(self, directory, capacity=24, derived_capacity=8):
+        """Constructs an empty SampleBank; nothing is read until a sample is asked for ~
+
+        @type self: SampleBank
+        @type directory: str
+        @type capacity: int
+        @type derived_capacity: int
+        @rtype: None
+        """
+
+        self.directory = directory
+        self.capacity = capacity
+        self.derived_capacity = derived_capacity
+        self.frames = {}
+        self.rates = {}
+        self.derived_frames = OrderedDict()
+        self.sounds = OrderedDict()
+        self.loads = 0
+        self.hits = 0
+        self.drops = 0
+        self.derived = 0
+        self.load_time = 0.0
+
+    def sample_frames(self, name):
+        """Returns the 16-bit frames of a sample, of shape (frames, channels): memory-mapped from its recording, or
+        derived from its anchor's ~
+
+        @type self: SampleBank
+        @type name: str
+            e.g. 'bassF_'; a recording's file name without '.wav'
+        @rtype: np.ndarray
+        """
+
+        if name in derived_samples:
+            if name in self.derived_frames:
+                self.derived_frames.move_to_end(name)
+                return self.derived_frames[name]
+
+            anchor, semitones = derived_samples[name]
+            anchor_frames = self.sample_frames(anchor)
+
+            start = time.perf_counter()
+            frames = shift_pitch(anchor_frames, semitones)
+            self.rates[name] = self.rates[anchor]
+            self.derived += 1
+            self.load_time += time.perf_counter() - start
+
+            if self.derived_capacity > 0:
+                self.derived_frames[name] = frames
+                while len(self.derived_frames) > self.derived_capacity:
+                    self.derived_frames.popitem(last=False)
+
+            return frames
+
+        if name not in self.frames:
+            start = time.perf_counter()
+            self.frames[name], self.rates[name] = map_wav(os.path.join(self.directory, name + '.wav'))
+            self.load_time += time.perf_counter() - start
+
+        return self.frames[name]
+
+    def sound(self, name, volume=1.0):
+        """Returns the Sound of a sample, creating it if it is not kept ~
+        The mixer must be initialised, with signed 16-bit samples; a Sound is created with volume, which is otherwise
+        left as it is ~
+
+        @type self: SampleBank
+        @type name: str
+        @type volume: float
+        @rtype: pygame.mixer.Sound
+        """
+
+        import pygame
+
+        if name in self.sounds:
+            self.hits += 1
+            self.sounds.move_to_end(name)
+            return self.sounds[name]
+
+        frames = self.sample_frames(name)
+        start = time.perf_counter()
+
+        # The frames are copied into the Sound, converted to the mixer's format if they do not match it
+        frames = mixer_frames(frames, self.rates[name], pygame.mixer.get_init())
+        curr_sound = pygame.mixer.Sound(buffer=np.ascontiguousarray(frames))
+        curr_sound.set_volume(volume)
+
+        self.load_time += time.perf_counter() - start
+        self.loads += 1
+
+        self.sounds[name] = curr_sound
+        self.drop_unused()
+
+        return curr_sound
+
+    def drop_unused(self):
+        """Drops the least recently used Sounds which are not playing, until at most capacity are kept ~
+
+        @type self: SampleBank
+        @rtype: None
+        """
+
+        for name in list(self.sounds):
+            if len(self.sounds) <= self.capacity:
+                return
+            if self.sounds[name].get_num_channels() == 0:
+                del self.sounds[name]
+                self.drops += 1
+
+    def report(self):
+        """Returns how much a SampleBank (self) has loaded, how long it took, and the process' resident memory ~
+
+        @type self: SampleBank
+        @rtype: dict{str: int | float}
+        """
+
+        return {'mapped': len(self.frames), 'derived': self.derived, 'kept': len(self.sounds),
+                'derived_kept': len(self.derived_frames), 'loads': self.loads, 'hits': self.hits, 'drops': self.drops,
+                'load_ms': self.load_time * 1e3, 'rss_mb': resident_mb()}
+
+
+def map_wav(path):
+    """Returns the frames of a 16-bit PCM .wav file, memory-mapped, of shape (frames, channels), and its frame rate ~
+    Only the file's header is read ~
+
+    @type path: str
+    @rtype: (np.memmap, int)
+    """
+
+    with open(path, 'rb') as wav_file:
+        if wav_file.read(4) != b'RIFF' or wav_file.read(8)[4:] != b'WAVE':
+            raise ValueError('{} is not a .wav file'.format(path))
+
+        channels = rate = None
+        while True:
+            chunk = wav_file.read(8)
+            if len(chunk) < 8:
+                raise ValueError('{} has no data chunk'.format(path))
+            size = int.from_bytes(chunk[4:], 'little')
+
+            if chunk[:4] == b'fmt ':
+                fmt = wav_file.read(size)
+                channels = int.from_bytes(fmt[2:4], 'little')
+                rate = int.from_bytes(fmt[4:8], 'little')
+                if int.from_bytes(fmt[:2], 'little') != 1 or int.from_bytes(fmt[14:16], 'little') != 16:
+                    raise ValueError('{} is not 16-bit PCM'.format(path))
+            elif chunk[:4] == b'data':
+                if channels is None:
+                    raise ValueError('{} has no fmt chunk before its data'.format(path))
+                return np.memmap(path, dtype='<i2', mode='r', offset=wav_file.tell(),
+                                 shape=(size // (2 * channels), channels)), rate
+            else:
+                wav_file.seek(size, 1)
+
+            # Chunks are padded to an even size
+            if size % 2:
+                wav_file.seek(1, 1)
+
+
+def shift_pitch(frames, semitones):
+    """Returns 16-bit frames resampled such that they sound some semi-tones higher (or lower, if negative); higher
+    frames are shorter, and lower ones longer ~
+
+    @type frames: np.ndarray
+        of shape (frames, channels)
+    @type semitones: int | float
+    @rtype: np.ndarray
+    """
+
+    return resample(frames, 2 ** (semitones / 12))
+
+
+def mixer_frames(frames, rate, mixer):
+    """Returns 16-bit frames at some frame rate converted to the format of the mixer, unchanged if they match it ~
+
+    @type frames: np.ndarray
+        of shape (frames, channels)
+    @type rate: int
+    @type mixer: (int, int, int)
+        (frequency, size, channels), as from pygame.mixer.get_init()
+    @rtype: np.ndarray
+    """
+
+    frequency, size, channels = mixer
+    if size != -16:
+        raise ValueError('samples can only be played by a signed 16-bit mixer, not size {}'.format(size))
+
+    if rate != frequency:
+        frames = resample(frames, rate / frequency)
+
+    if frames.shape[1] != channels:
+        if frames.shape[1] == 1:
+            frames = np.repeat(frames, channels, axis=1)
+        elif channels == 1:
+            frames = np.rint(frames.mean(axis=1, keepdims=True)).astype('<i2')
+        else:
+            raise ValueError('{}-channel samples cannot be played by a {}-channel mixer'.format(frames.shape[1],
+                                                                                                 channels))
+
+    return frames
+
+
+def resample(frames, ratio):
+    """Returns 16-bit frames resampled by linear interpolation, stepping ratio frames through them per frame
+    returned; frames are shortened if ratio is above 1, and lengthened if below ~
+
+    @type frames: np.ndarray
+        of shape (frames, channels)
+    @type ratio: float
+    @rtype: np.ndarray
+    """
+
+    positions = np.arange(int((len(frames) - 1) / ratio) + 1) * ratio
+    index = positions.astype(np.intp)
+    fraction = (positions - index).astype(np.float32)
+
+    # Channel by channel, with the last frame repeated, such that every position has a frame after it
+    channels = np.empty((frames.shape[1], len(frames) + 1), dtype=np.float32)
+    channels[:, :-1] = frames.T
+    channels[:, -1] = frames[-1]
+
+    shifted = channels[:, index]
+    step = channels[:, index + 1]
+    step -= shifted
+    step *= fraction
+    shifted += step
+
+    return np.rint(shifted.T).astype('<i2')
+
+
+def resident_mb():
+    """Returns the resident memory of this process in MB, or its peak if the current figure is not available ~
+
+    @rtype: float
+    """
+
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
@@ -0,0 +1,173 @@
+"""Contains class Scheduler, which dispatches a precomputed timeline of sound starts and stops from its own thread ~
+
+The thread sleeps until shortly before each event and then yields until the event is due, such that events are
+dispatched on time however busy the UI thread is, and the UI thread only draws and handles input ~
+"""
+
+import threading
+import time
+import sys
+
+# Thread switch interval while any Scheduler runs
+SWITCH_INTERVAL = 0.0001
+
+# Schedulers running, and the interpreter's switch interval from before the first of them started; the interval is
+# lowered as the first starts, and restored as the last ends, however their runs overlap
+switch_lock = threading.Lock()
+switch_state = {'running': 0, 'saved': None}
+
+
+class Scheduler:
+    """Represents a timeline of events, played once or over and over by a thread of its own ~
+
+    Every event's time is counted from the start of the timeline, so that lateness never accumulates from one event
+    (or pass) to the next ~
+
+    === Attributes ===
+    @type events: list[(float, function, tuple)]
+        seconds from the start of a pass, the function to call, and its arguments, sorted by time; events at the same
+        time are called in the order they were given
+    @type period: float | None
+        seconds per pass; if None, the events are played once
+    @type spin: float
+        seconds before an event at which the thread stops sleeping and yields until the event is due
+    @type lateness: list[float]
+        seconds each event was called after it was due, in the order called
+    @type passes: int
+        passes played through so far
+    @type stopped: threading.Event
+    @type thread: threading.Thread | None
+    """
+
+    def __init__(self, events, period=None, spin=0.002):
+        """Constructs a Scheduler which has not started ~
+
+        @type self: Scheduler
+        @type events: list[(float, function, tuple)]
+        @type period: float | None
+        @type spin: float
+        @rtype: None
+        """
+
+        self.events = sorted(events, key=lambda event: event[0])
+        self.period = period
+        self.spin = spin
+        self.lateness = []
+        self.passes = 0
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Starts playing a Scheduler (self) from the first event, now ~
+
+        @type self: Scheduler
+        @rtype: None
+        """
+
+        self.thread = threading.Thread(target=self.run, args=(time.perf_counter(),), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stops a Scheduler (self), waiting for an event being called to return; no further event is called ~
+
+        @type self: Scheduler
+        @rtype: None
+        """
+
+        self.stopped.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def run(self, start):
+        """Calls every event of a Scheduler (self) when it is due, counted from start, until stopped ~
+
+        While any Scheduler runs, the interpreter switches threads every tenth of a millisecond rather than every
+        five, such that a busy UI thread holds the GIL for at most that long whenever an event is due, or an event's
+        sound call releases it; see lower_switch_interval() ~
+
+        @type self: Scheduler
+        @type start: float
+            time.perf_counter() at the start of the first pass
+        @rtype: None
+        """
+
+        lower_switch_interval()
+
+        try:
+            while True:
+                for seconds, function, args in self.events:
+                    due = start + seconds
+                    if not self.wait_until(due):
+                        return
+
+                    self.lateness.append(time.perf_counter() - due)
+                    function(*args)
+
+                self.passes += 1
+                if self.period is None:
+                    return
+                start += self.period
+
+        finally:
+            restore_switch_interval()
+
+    def wait_until(self, due):
+        """Waits until due, and returns whether a Scheduler (self) is still playing ~
+
+        @type self: Scheduler
+        @type due: float
+            a time.perf_counter() time
+        @rtype: bool
+        """
+
+        while True:
+            remaining = due - time.perf_counter()
+            if remaining <= 0:
+                return not self.stopped.is_set()
+
+            if remaining > self.spin:
+                if self.stopped.wait(remaining - self.spin):
+                    return False
+            else:
+                time.sleep(0)
+
+    def report(self):
+        """Returns how many events a Scheduler (self) has called, and how late they were, in milliseconds ~
+
+        @type self: Scheduler
+        @rtype: dict{str: int | float}
+        """
+
+        lateness = sorted(self.lateness)
+        if not lateness:
+            return {'events': 0, 'passes': self.passes, 'mean_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+
+        return {'events': len(lateness), 'passes': self.passes, 'mean_ms': sum(lateness) / len(lateness) * 1e3,
+                'p99_ms': lateness[int(0.99 * (len(lateness) - 1))] * 1e3, 'max_ms': lateness[-1] * 1e3}
+
+
+def lower_switch_interval():
+    """Lowers the interpreter's thread switch interval to SWITCH_INTERVAL as a Scheduler starts running, saving the
+    interval it had if no other Scheduler is running ~
+
+    @rtype: None
+    """
+
+    with switch_lock:
+        if switch_state['running'] == 0:
+            switch_state['saved'] = sys.getswitchinterval()
+            sys.setswitchinterval(min(switch_state['saved'], SWITCH_INTERVAL))
+        switch_state['running'] += 1
+
+
+def restore_switch_interval():
+    """Restores the interpreter's saved thread switch interval as a Scheduler stops running, if it was the last ~
+
+    @rtype: None
+    """
+
+    with switch_lock:
+        switch_state['running'] -= 1
+        if switch_state['running'] == 0:
+            sys.setswitchinterval(switch_state['saved'])
+            switch_state['saved'] = None
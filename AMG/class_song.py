@@ -0,0 +1,132 @@
+"""Contains class Song, which is comprised of Loops ~ """
+
+from class_loop import *
+
+# Forms of a phrase of four sections; each letter is one of a Song's themes
+phrase_forms = ('AABA', 'ABAB', 'AABB', 'ABAC', 'ABCA')
+
+
+class Song:
+    """Represents a long-form piece, which is comprised of sections; each section is a written Loop ~
+
+    Every theme is written once, and a section repeating a theme either shares the theme's Loop or is a variation of
+    it (see Loop.create_variation()), such that writing a Song takes time and memory linear in its measures ~
+
+    === Attributes ===
+    @type measures: int
+    @type intensity: int
+    @type section_measures: int
+    @type seed: int
+        a Song is fully determined by (measures, intensity, section_measures, seed)
+    @type rng: random.Random
+    @type key: dict{'root': str (e.g. 'Ab'), 'quality': str (e.g. 'major')}
+        the key of every section
+    @type themes: list[Loop]
+    @type sections: list[Loop]
+        the Loop heard in each section, in order; a Loop appears once per section it is heard in
+    """
+
+    def __init__(self, measures, intensity, section_measures=8, seed=None):
+        """Constructs an empty Song ~
+        If no seed is given, one is drawn from the global random module and kept in self.seed for replaying ~
+
+        @type self: Song
+        @type measures: int
+        @type intensity: int
+        @type section_measures: int
+        @type seed: int | None
+        @rtype: None
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+
+        self.measures = measures
+        self.intensity = intensity
+        self.section_measures = section_measures
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        root, quality = self.rng.choice(loop_keys)
+        self.key = {'root': root, 'quality': quality}
+
+        self.themes = []
+        self.sections = []
+
+    def write_song(self):
+        """Takes an empty Song (self) and writes its themes, then lays them out into sections ~
+        This is a mutating function ~
+
+        Sections follow phrase_forms four at a time; the first theme keeps the Song's intensity, and the others may
+        be one more or one less intense. A repeated theme is varied with chance 1 in 3. If measures is not a multiple
+        of section_measures, the Song ends with a shorter section of its own ~
+
+        @type self: Song
+        @rtype: None
+        """
+
+        for letter in 'ABC':
+            if letter == 'A':
+                intensity = self.intensity
+            else:
+                intensity = min(max(self.intensity + self.rng.randint(-1, 1), 0), 4)
+
+            self.themes.append(self.write_section(self.section_measures, intensity))
+
+        heard = set()
+        form = ''
+        for _ in range(self.measures // self.section_measures):
+            if not form:
+                form = self.rng.choice(phrase_forms)
+
+            theme = self.themes['ABC'.index(form[0])]
+            form = form[1:]
+
+            if theme in heard and self.rng.randint(0, 2) == 0:
+                self.sections.append(theme.create_variation(self.rng.getrandbits(64)))
+            else:
+                self.sections.append(theme)
+            heard.add(theme)
+
+        if self.measures % self.section_measures:
+            self.sections.append(self.write_section(self.measures % self.section_measures, self.intensity))
+
+    def to_events(self):
+        """Returns every note event of a written Song (self), its sections played one after another, as one Timeline ~
+        Each section is placed from the registers the section before it ended in, such that a Loop heard in several
+        sections may be played in different octaves, and no part jumps at a section's start ~
+
+        @type self: Song
+        @rtype: Timeline
+        """
+
+        registers = {}
+
+        return concatenate_timelines([curr_section.to_events(registers=registers) for curr_section in self.sections])
+
+    def write_section(self, measures, intensity):
+        """Returns a newly written Loop in the Song's (self) key ~
+
+        @type self: Song
+        @type measures: int
+        @type intensity: int
+        @rtype: Loop
+        """
+
+        section = Loop(measures, intensity, seed=self.rng.getrandbits(64))
+        section.key = self.key
+        section.write_loop()
+
+        return section
+
+
+if __name__ == '__main__':
+    song = Song(64, 2, seed=0)
+    song.write_song()
+
+    print(song.key['root'], song.key['quality'])
+    for curr_section in song.sections:
+        if curr_section in song.themes:
+            print('ABC'[song.themes.index(curr_section)], end=' ')
+        else:
+            print('~', end=' ')
+    print()
@@ -0,0 +1,185 @@
+"""Contains class Timeline, one sorted, columnar list of the note events of every part of a written Loop ~ """
+
+from midi_generation import midi_number, find_closest
+from registers import stack_voicings, REST
+import numpy as np
+
+# Every part of a Timeline, numbered in this order; the last four are the percussion Frames
+part_names = ('harm', 'melody', 'bass', 'kick', 'snare', 'closed_hat', 'open_hat')
+
+# General MIDI percussion key of each drum part
+drum_keys = {'kick': 36, 'snare': 38, 'closed_hat': 42, 'open_hat': 46}
+
+# Velocity of every event of each part
+part_velocities = {'harm': 45, 'melody': 64, 'bass': 64, 'kick': 64, 'snare': 64, 'closed_hat': 64, 'open_hat': 64}
+
+
+class Timeline:
+    """Represents the note events of a written Loop as parallel arrays, sorted by onset, then part, then pitch ~
+    Times are counted in steps (eighth notes) from the start of the Loop ~
+
+    === Attributes ===
+    @type onset: np.ndarray
+    @type duration: np.ndarray
+    @type part: np.ndarray
+        index into part_names
+    @type pitch: np.ndarray
+        MIDI note number, in the register the event is played in; drums use General MIDI percussion keys
+    @type velocity: np.ndarray
+    @type length: int
+        steps in the Loop, such that a repeat of it starts at step length
+    """
+
+    __slots__ = ('onset', 'duration', 'part', 'pitch', 'velocity', 'length')
+
+    def __init__(self, onset, duration, part, pitch, velocity, length):
+        """Constructs a Timeline from unsorted columns of events ~
+
+        @type self: Timeline
+        @type onset: list[int] | np.ndarray
+        @type duration: list[int] | np.ndarray
+        @type part: list[int] | np.ndarray
+        @type pitch: list[int] | np.ndarray
+        @type velocity: list[int] | np.ndarray
+        @type length: int
+        @rtype: None
+        """
+
+        onset = np.asarray(onset, dtype=np.int64)
+        part = np.asarray(part, dtype=np.int64)
+        pitch = np.asarray(pitch, dtype=np.int64)
+        order = np.lexsort((pitch, part, onset))
+
+        self.onset = onset[order]
+        self.duration = np.asarray(duration, dtype=np.int64)[order]
+        self.part = part[order]
+        self.pitch = pitch[order]
+        self.velocity = np.asarray(velocity, dtype=np.int64)[order]
+        self.length = length
+
+    def __len__(self):
+        """Returns the number of events in a Timeline (self) ~
+
+        @type self: Timeline
+        @rtype: int
+        """
+
+        return len(self.onset)
+
+    def select(self, part):
+        """Returns a new Timeline of the events of one part of a Timeline (self) ~
+
+        @type self: Timeline
+        @type part: str
+        @rtype: Timeline
+        """
+
+        mask = self.part == part_names.index(part)
+
+        return Timeline(self.onset[mask], self.duration[mask], self.part[mask], self.pitch[mask],
+                        self.velocity[mask], self.length)
+
+
+def concatenate_timelines(timelines):
+    """Returns one Timeline of several played one after another ~
+
+    @type timelines: list[Timeline]
+    @rtype: Timeline
+    """
+
+    offsets = np.cumsum([0] + [timeline.length for timeline in timelines])
+
+    return Timeline(np.concatenate([timeline.onset + offset for timeline, offset in zip(timelines, offsets)]),
+                    np.concatenate([timeline.duration for timeline in timelines]),
+                    np.concatenate([timeline.part for timeline in timelines]),
+                    np.concatenate([timeline.pitch for timeline in timelines]),
+                    np.concatenate([timeline.velocity for timeline in timelines]),
+                    int(offsets[-1]))
+
+
+def loop_timeline(curr_loop, voice_leading=False, registers=None):
+    """Returns the Timeline of a written Loop (curr_loop); see Loop.to_events() ~
+
+    Each part is read in one pass over its final (or, for drums, its only) Frame. Melody, bass, and every harmony
+    voice are each placed by find_closest() from their previous note; voices after the first of each chord are
+    played an octave lower, the melody as placed, and the bass three octaves lower ~
+
+    @type curr_loop: Loop
+    @type voice_leading: bool
+        if True, the voices of each chord are led jointly instead, stacked in close position above the bottom voice
+        (see registers.stack_voicings()), and every voice is played in the bottom voice's octave
+    @type registers: dict{str: list[int] | int} | None
+        if given, the last placed note of 'harm' (one per voice), 'melody', and 'bass' of whatever was played before
+        the Loop; each part starts from it, and it is updated to the Loop's own last notes, such that Loops played
+        one after another are placed as one
+    @rtype: Timeline
+    """
+
+    if registers is None:
+        registers = {}
+
+    onsets = []
+    durations = []
+    parts = []
+    pitches = []
+    velocities = []
+
+    def add_event(onset, duration, part, pitch):
+        onsets.append(onset)
+        durations.append(duration)
+        parts.append(part)
+        pitches.append(pitch)
+        velocities.append(part_velocities[part_names[part]])
+
+    # Harmony; a voice which joins after the first chord is placed from a rest, as generate_track() would
+    harm_notes = curr_loop.harm['final'].notes
+    if voice_leading:
+        voice_count = max(len(curr_note.value['voicing']) for curr_note in harm_notes)
+        stacked = stack_voicings(np.array([[midi_number(curr_note.value['voicing'][i])
+                                            if i < len(curr_note.value['voicing']) else REST
+                                            for curr_note in harm_notes] for i in range(voice_count)]),
+                                 registers['harm'][0] if 'harm' in registers else None)
+        placed = stacked[0][stacked[0] != REST]
+        if len(placed):
+            registers['harm'] = [int(placed[-1])]
+
+        onset = 0
+        for i2, curr_note in enumerate(harm_notes):
+            for i in range(len(curr_note.value['voicing'])):
+                add_event(onset, curr_note.length, 0, int(stacked[i, i2]))
+            onset += curr_note.length
+
+    else:
+        pastnotes = list(registers.get('harm', []))
+        onset = 0
+        for curr_note in harm_notes:
+            for i, pitch in enumerate(curr_note.value['voicing']):
+                if i == len(pastnotes):
+                    pastnotes.append(midi_number(pitch) if onset == 0 else midi_number(None))
+
+                pastnotes[i] = find_closest(pastnotes[i], midi_number(pitch))
+                add_event(onset, curr_note.length, 0, pastnotes[i] if i == 0 else pastnotes[i] - 12)
+            onset += curr_note.length
+        registers['harm'] = pastnotes
+
+    # Melody and bass
+    for part, octave in [(1, 0), (2, -3)]:
+        notes = curr_loop.melody['final'].notes if part == 1 else curr_loop.bass['final'].notes
+        pastnote = registers.get(part_names[part], midi_number(notes[0].value))
+        onset = 0
+
+        for curr_note in notes:
+            if curr_note.value is not None:
+                pastnote = find_closest(pastnote, midi_number(curr_note.value))
+                add_event(onset, curr_note.length, part, pastnote + octave * 12)
+            onset += curr_note.length
+        registers[part_names[part]] = pastnote
+
+    # Drums, one step long each
+    for part in range(3, len(part_names)):
+        instrument = part_names[part]
+        for curr_note in curr_loop.perc[instrument].notes:
+            if curr_note.value == instrument:
+                add_event(curr_note.index, 1, part, drum_keys[instrument])
+
+    return Timeline(onsets, durations, parts, pitches, velocities, 8 * curr_loop.measures)
@@ -4,19 +4,68 @@
 class Voicing:
     """Represents the particular notes of a four-voice chord
 
+    Voicings are immutable and interned: constructing a Voicing with the same notes and depth as an existing Voicing
+    returns that same object
+
     === Attributes ===
-    @type notes: list[int]
+    @type notes: tuple[int]
     @type depth: int
     """
 
-    def __init__(self, notes, depth):
-        """Constructs a voicing
+    __slots__ = ('notes', 'depth')
+    _interned = {}
 
-        @type self: Voicing
-        @type notes: list[int]
+    def __new__(cls, notes, depth):
+        """Constructs a voicing, or returns the existing Voicing with these notes and depth
+
+        @type cls: type
+        @type notes: list[int] | tuple[int]
         @type depth: int
+        @rtype: Voicing
+        """
+
+        key = (tuple(notes), depth)
+        voicing = cls._interned.get(key)
+
+        if voicing is None:
+            voicing = object.__new__(cls)
+            object.__setattr__(voicing, 'notes', key[0])
+            object.__setattr__(voicing, 'depth', depth)
+            cls._interned[key] = voicing
+
+        return voicing
+
+    def __setattr__(self, name, value):
+        """Voicings are immutable
+
+        @type self: Voicing
+        @type name: str
+        @type value: object
         @rtype: None
         """
 
-        self.notes = notes
-        self.depth = depth
+        raise AttributeError('Voicing objects are immutable')
+
+    def __reduce__(self):
+        """Pickles a Voicing by its attributes, such that unpickling returns the interned Voicing
+
+        @type self: Voicing
+        @rtype: (type, (tuple[int], int))
+        """
+
+        return Voicing, (self.notes, self.depth)
+
+    def alter(self, changes):
+        """Returns the Voicing whose notes are those of self with the given positions replaced
+
+        @type self: Voicing
+        @type changes: dict{int: int}
+            position in notes -> new note
+        @rtype: Voicing
+        """
+
+        notes = list(self.notes)
+        for position in changes:
+            notes[position] = changes[position]
+
+        return Voicing(notes, self.depth)
@@ -17,35 +17,74 @@ def construct_harmony(curr_loop):
     """
 
     # Constructing the shell chords
-    prev_chord = None
-    prev_voice = None
-
     for i in range(curr_loop.measures):
-        curr_chord = shell_chord(curr_loop, i, prev_chord)
-        curr_voice = get_voicing(curr_chord, curr_loop, prev_voice)
-
-        prev_chord = curr_chord
-        prev_voice = curr_voice
-
-        for curr_note in curr_loop.harm['shell'].measures[i].notes:
-            curr_note.value = {'chord': curr_chord, 'voicing': curr_voice}
+        shell_measure(curr_loop, i)
 
     # Decorating with passing chords
-    curr_loop.harm['passing'] = curr_loop.harm['shell'].extend().collapse(curr_loop)
     for curr_measure in curr_loop.harm['passing'].measures:
         passing_chords(curr_measure, curr_loop)
 
     # Constructing the rhythmic attack/sustain Frame
-    temp_harm = curr_loop.harm['rhythm'].extend()
-    for curr_note in temp_harm.measures[0].notes:
+    for i in range(curr_loop.measures):
+        harmony_rhythm(curr_loop, i)
+
+    finish_harmony(curr_loop)
+
+
+def shell_measure(curr_loop, i):
+    """Writes the shell chord of measure i of a Loop (curr_loop), once every measure before it has its shell chord ~
+    The chord is written to both the 'shell' and 'passing' Frames, ready to be decorated by passing_chords() ~
+    This is a mutating function ~
+
+    @type curr_loop: Loop
+    @type i: int
+    @rtype: None
+    """
+
+    if i == 0:
+        prev_chord = None
+        prev_voice = None
+    else:
+        prev_chord = curr_loop.harm['shell'].measures[i-1].notes[0].value['chord']
+        prev_voice = curr_loop.harm['shell'].measures[i-1].notes[0].value['voicing']
+
+    curr_chord = shell_chord(curr_loop, i, prev_chord)
+    curr_voice = get_voicing(curr_chord, curr_loop, prev_voice)
+
+    # One value dict is shared by every step of the measure
+    curr_value = {'chord': curr_chord, 'voicing': curr_voice}
+    for curr_note in curr_loop.harm['shell'].measures[i].notes:
+        curr_note.value = curr_value
+    for curr_note in curr_loop.harm['passing'].measures[i].notes:
+        curr_note.value = curr_value
+
+
+def harmony_rhythm(curr_loop, i):
+    """Writes the attacks ('A') and sustains ('S') of the harmony in measure i of a Loop (curr_loop) ~
+    Measure i, and the one before it, must already be decorated with passing chords ~
+    This is a mutating function ~
+
+    @type curr_loop: Loop
+    @type i: int
+    @rtype: None
+    """
+
+    for curr_note in curr_loop.harm['rhythm'].measures[i].notes:
         if curr_note.index == 0:
             curr_note.value = 'A'
         elif curr_loop.harm['passing'][curr_note.index].value == curr_loop.harm['passing'][curr_note.index-1].value:
             curr_note.value = 'S'
         else:
             curr_note.value = 'A'
-    curr_loop.harm['rhythm'] = temp_harm.collapse(curr_loop)
 
-    # Constructing the final compressed harmony Frame
+
+def finish_harmony(curr_loop):
+    """Constructs the final compressed harmony Frame of a Loop (curr_loop), once every measure is written ~
+    This is a mutating function ~
+
+    @type curr_loop: Loop
+    @rtype: None
+    """
+
     curr_loop.harm['final'] = curr_loop.harm['passing'].extend().collapse(curr_loop)
     curr_loop.harm['final'].compress()
@@ -1,7 +1,7 @@
 """Contains/instantiates the objects of type Chord, Voicing, and Family ~
 
-Note that for Voicing, there is a function which resets the objects ~
-This is used in cases when the voicings were altered to cater to exceptional chords ~
+Note that for Voicing, there is a function which returns fresh lists of the (interned) objects ~
+These lists are altered to cater to exceptional chords ~
 e.g. II-7b5 vs II-7, Imaj7 does not used #11, etc ~
 """
 
@@ -82,7 +82,7 @@ qualities = ['major', 'minor', 'dominant']
 
 
 def set_voicings():
-    """Resets all voicings ~
+    """Returns new lists of all voicings; the Voicing objects themselves are interned and immutable ~
 
     @rtype: list[list[Voicing]]
     """
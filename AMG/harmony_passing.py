@@ -3,7 +3,6 @@
 from class_loop import *
 from harmony_voicing import *
 from functions import *
-import random
 
 
 def passing_chords(curr_measure, curr_loop):
@@ -18,29 +17,30 @@ def passing_chords(curr_measure, curr_loop):
     shell_harm = curr_measure.notes[0].value['chord']
 
     if curr_measure.next is None:  # Adding turn-around
-        if random.randint(0, 2) == 0 and curr_loop.attributes['tritone'] >= 2:
+        if curr_loop.rng.randint(0, 2) == 0 and curr_loop.attributes['tritone'] >= 2:
 
             # Choosing between subV7/I, V7, and bII for fourth beat of measure
             if curr_loop.attributes['tritone'] >= 2:
-                add_chord = random.choice([subV7ofI, V])
+                add_chord = curr_loop.rng.choice([subV7ofI, V])
             else:
                 add_chord = bII
 
             add_voicing = get_voicing(add_chord, curr_loop, curr_measure.notes[0].value['voicing'])
 
-            curr_measure.notes[6].value = {'chord': add_chord, 'voicing': add_voicing}
-            curr_measure.notes[7].value = {'chord': add_chord, 'voicing': add_voicing}
+            add_value = {'chord': add_chord, 'voicing': add_voicing}
+            curr_measure.notes[6].value = add_value
+            curr_measure.notes[7].value = add_value
 
-            if random.randint(0, 1) == 0:
+            if curr_loop.rng.randint(0, 1) == 0:
                 two_five(curr_loop.key['quality'], V, 4, 6, curr_loop, curr_measure, -5)
 
     elif shell_harm.quality == 'dominant':  # Adding a relative ii to complete a 2-5
-        if random.randint(0, 1) == 0:
+        if curr_loop.rng.randint(0, 1) == 0:
 
             if shell_harm not in ma_sub_dominant.chords + mi_sub_dominant.chords:  # not substitute dominant
-                delta = random.choice([-5, -5, -5, 1])
+                delta = curr_loop.rng.choice([-5, -5, -5, 1])
             else:  # shell_harm is substitute dominant
-                delta = random.choice([1, 1, 1, -5])
+                delta = curr_loop.rng.choice([1, 1, 1, -5])
 
             # first (and currently only) chord of the next measure; curr_measure.next is never None, since the last
             # Measure of Frame.measures is caught by first 'if' statement
@@ -48,7 +48,7 @@ def passing_chords(curr_measure, curr_loop):
 
             two_five(next_shell.quality, shell_harm, 0, 4, curr_loop, curr_measure, delta)
 
-    elif random.randint(0, 1) == 0:
+    elif curr_loop.rng.randint(0, 1) == 0:
         # If (2-4) tritone rating: adding subV7 or V7 (with possible relative ii) to prepare next chord
         # If (0-1) tritone rating: adding chill chords on third and/or fourth beat for variety
 
@@ -60,12 +60,13 @@ def passing_chords(curr_measure, curr_loop):
 
             # This code runs twice such that there may be distinct chords on third and fourth beat
             for _ in range(2):
-                add_chord = random.choice(chord_options)
+                add_chord = curr_loop.rng.choice(chord_options)
                 add_voicing = get_voicing(add_chord, curr_loop, curr_measure.notes[0].value['voicing'])
+                add_value = {'chord': add_chord, 'voicing': add_voicing}
 
                 # Adding the new chord to either the final half or final quarter of the measure
-                for i in range(random.choice([4, 6]), 8):
-                    curr_measure.notes[i].value = {'chord': add_chord, 'voicing': add_voicing}
+                for i in range(curr_loop.rng.choice([4, 6]), 8):
+                    curr_measure.notes[i].value = add_value
 
             return
 
@@ -78,11 +79,12 @@ def passing_chords(curr_measure, curr_loop):
                      add_chord in ma_sec_dom.chords + mi_sec_dom.chords):
 
                 add_voicing = get_voicing(add_chord, curr_loop, curr_measure.notes[0].value['voicing'])
-                for i in range(random.choice([4, 6]), 8):
-                    curr_measure.notes[i].value = {'chord': add_chord, 'voicing': add_voicing}
+                add_value = {'chord': add_chord, 'voicing': add_voicing}
+                for i in range(curr_loop.rng.choice([4, 6]), 8):
+                    curr_measure.notes[i].value = add_value
 
                 # Adding a relative ii
-                if random.randint(0, 2) == 0:
+                if curr_loop.rng.randint(0, 2) == 0:
                     two_five(next_shell.quality, add_chord, 4, 6, curr_loop, curr_measure, 1)
 
                 return
@@ -111,6 +113,7 @@ def two_five(factor, relative_v, start, stop, curr_loop, curr_measure, delta):
         add_chord = Chord('relII-7b5', 'minor', interval)
 
     add_voicing = get_voicing(add_chord, curr_loop, curr_measure.notes[0].value['voicing'])
+    add_value = {'chord': add_chord, 'voicing': add_voicing}
 
     for i in range(start, stop):
-        curr_measure.notes[i].value = {'chord': add_chord, 'voicing': add_voicing}
+        curr_measure.notes[i].value = add_value
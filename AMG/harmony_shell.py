@@ -2,7 +2,14 @@
 
 from class_loop import *
 from functions import *
-import random
+from bisect import bisect_right
+from math import gcd
+
+# (key quality, tritone rating, final) -> cumulative family weights; each table is built on first use
+family_tables = {}
+
+# (key quality, tritone rating, previous chord, final) -> (chords, cumulative weights); each built on first use
+resolution_tables = {}
 
 
 def shell_chord(curr_loop, curr_measure, prev_chord):
@@ -42,17 +49,11 @@ def shell_chord(curr_loop, curr_measure, prev_chord):
 
     # Final chord should not be dominant (except primary dominant)
     elif curr_measure == curr_loop.measures - 1:
-        true = True
-        while true:
-            chord_family = choose_family(curr_loop)
-            if chord_family.chords[0].quality != 'dominant' or \
-                    chord_family.chords[0].quality == 'dominant' and chord_family.chords[0].name == 'V7':
-                true = False
-        return choose_chord(chord_family, prev_chord)
+        return choose_chord(choose_family(curr_loop, True), prev_chord, curr_loop)
 
     # Not an exceptional case; default chord selection procedure
     else:
-        return choose_chord(choose_family(curr_loop), prev_chord)
+        return choose_chord(choose_family(curr_loop), prev_chord, curr_loop)
 
 
 def dominant_resolution(curr_loop, curr_measure, prev_chord):
@@ -69,71 +70,161 @@ def dominant_resolution(curr_loop, curr_measure, prev_chord):
         return_lst = [V, V, subV7ofI]
         if curr_loop.attributes['tension'] < 3:
             return_lst.extend([bII, bII, bII])
-        return random.choice(return_lst)
+        return curr_loop.rng.choice(return_lst)
 
     # case II: return either a chord 7 semitones below (equivalent to 5 above), 2 up / 10 down, or 1 down / 11 up
-    e = True
-    while e:
-        chord_family = choose_family(curr_loop)
-        return_chords = []
-        return_chord = None
-
-        for chord_change in chord_family.chords:
-
-            # Resolve down perfect 5th (7 semi-tones)
-            if (prev_chord.interval - chord_change.interval) % 12 == 7:
-                e = False
-                return_chords.append(chord_change)
-                if prev_chord.name[:5] != 'subV7':
-                    return_chords.extend([chord_change, chord_change, chord_change])
-
-            # Resolve up major 2nd (2 semi-tones)
-            if (prev_chord.interval - chord_change.interval) % 12 == 10:
-                return_chords.append(chord_change)
-
-            # Resolve down minor 2nd (1 semi-tone)
-            if (prev_chord.interval - chord_change.interval) % 12 == 1:
-                e = False
-                return_chords.append(chord_change)
-                if prev_chord.name[:5] == 'subV7':
-                    return_chords.extend([chord_change, chord_change, chord_change])
-
-        # If chords from the chosen family have been found to be appropriate intervals from the previous chord
-        # for dominant resolution, assign return_chord to a random choice of those chords
-        if len(return_chords) > 0:
-            return_chord = random.choice(return_chords)
-
-        # For final chord of measure, if a dominant chord that does not resolve to tonic has been selected
-        # then run the while loop again to find a new chord
-        if curr_measure == curr_loop.measures - 1 and return_chord is not None:
-            if return_chord.quality == 'dominant' and return_chord.name != 'V7':
-                e = True
-
-    return return_chord
-
-
-def choose_family(curr_loop):
+    chords, table = resolution_table(curr_loop.key['quality'], curr_loop.attributes['tritone'], prev_chord,
+                                     curr_measure == curr_loop.measures - 1)
+
+    return chords[bisect_right(table, curr_loop.rng.randrange(table[-1]))]
+
+
+def resolution_chords(curr_family, prev_chord):
+    """Returns the chords of a family which resolve a dominant chord (prev_chord), and whether they may be chosen ~
+
+    A chord appears once per way of being chosen. Chords resolving down a perfect 5th (7 semi-tones) or down a
+    minor 2nd (1 semi-tone) are favoured (x4) depending on whether prev_chord is a substitute dominant; chords
+    resolving up a major 2nd (2 semi-tones) are only chosen alongside one of those ~
+
+    @type curr_family: Family
+    @type prev_chord: Chord
+    @rtype: (list[Chord], bool)
+    """
+
+    return_chords = []
+    resolves = False
+
+    for chord_change in curr_family.chords:
+
+        # Resolve down perfect 5th (7 semi-tones)
+        if (prev_chord.interval - chord_change.interval) % 12 == 7:
+            resolves = True
+            return_chords.append(chord_change)
+            if prev_chord.name[:5] != 'subV7':
+                return_chords.extend([chord_change, chord_change, chord_change])
+
+        # Resolve up major 2nd (2 semi-tones)
+        if (prev_chord.interval - chord_change.interval) % 12 == 10:
+            return_chords.append(chord_change)
+
+        # Resolve down minor 2nd (1 semi-tone)
+        if (prev_chord.interval - chord_change.interval) % 12 == 1:
+            resolves = True
+            return_chords.append(chord_change)
+            if prev_chord.name[:5] == 'subV7':
+                return_chords.extend([chord_change, chord_change, chord_change])
+
+    return return_chords, resolves
+
+
+def resolution_table(key_quality, tritone, prev_chord, final):
+    """Returns every chord which may resolve a dominant chord (prev_chord), with cumulative integer weights ~
+    Tables are immutable and built once per (key_quality, tritone, prev_chord, final); see resolution_tables ~
+
+    The weights are those of drawing a family (see family_table), then a chord from resolution_chords(), and
+    drawing again until the family resolves prev_chord and, for the final chord of the loop, the chord is not a
+    dominant other than V7 ~
+
+    @type key_quality: str
+    @type tritone: int
+    @type prev_chord: Chord
+    @type final: bool
+    @rtype: ((Chord, ...), (int, ...))
+    """
+
+    key = (key_quality, tritone, prev_chord, final)
+    table = resolution_tables.get(key)
+
+    if table is None:
+        options = []
+        for curr_family in families:
+            family_weight = max(curr_family.get_weight(key_quality, tritone), 0)
+            return_chords, resolves = resolution_chords(curr_family, prev_chord)
+            if family_weight > 0 and resolves:
+                options.append((family_weight, return_chords))
+
+        # Scaling by the lcm of the list lengths keeps every weight an integer
+        scale = 1
+        for family_weight, return_chords in options:
+            scale = scale * len(return_chords) // gcd(scale, len(return_chords))
+
+        chords = []
+        weights = []
+        for family_weight, return_chords in options:
+            for chord_change in return_chords:
+                if final and chord_change.quality == 'dominant' and chord_change.name != 'V7':
+                    continue
+                if chord_change not in chords:
+                    chords.append(chord_change)
+                    weights.append(0)
+                weights[chords.index(chord_change)] += family_weight * scale // len(return_chords)
+
+        if not chords:
+            raise ValueError('no chord resolves {} in a {} key with tritone rating {}'.format(
+                prev_chord.name, key_quality, tritone))
+
+        cumulative = []
+        total = 0
+        for weight in weights:
+            total += weight
+            cumulative.append(total)
+
+        table = (tuple(chords), tuple(cumulative))
+        resolution_tables[key] = table
+
+    return table
+
+
+def family_table(key_quality, tritone, final=False):
+    """Returns the cumulative family weights for a key quality and tritone rating ~
+    Tables are immutable and built once per (key_quality, tritone, final); see family_tables ~
+
+    @type key_quality: str
+    @type tritone: int
+    @type final: bool
+        if True, dominant families other than primary_dominant are given no weight
+    @rtype: (int, int, ...)
+        cumulative weight of families[0], families[0:2], ..., families; negative weights count as 0
+    """
+
+    table = family_tables.get((key_quality, tritone, final))
+
+    if table is None:
+        cumulative = []
+        total = 0
+        for curr_family in families:
+            if not (final and curr_family.chords[0].quality == 'dominant' and curr_family.chords[0].name != 'V7'):
+                total += max(curr_family.get_weight(key_quality, tritone), 0)
+            cumulative.append(total)
+
+        table = tuple(cumulative)
+        family_tables[(key_quality, tritone, final)] = table
+
+    return table
+
+
+def choose_family(curr_loop, final=False):
     """Determines which chord family the next chord will belong to based on tritone ratings ~
     Used by block_chord() ~
 
     Higher tritone rating implies that a dominant chord family will be chosen ~
     Lower tritone rating implies that a major/minor chord family will be chosen ~
 
+    A family is drawn by bisecting its cumulative weight table; this is exactly random.choice() over a list holding
+    each family (weight) times ~
+
     @type curr_loop: Loop
+    @type final: bool
+        if True, the family is drawn as if families were redrawn until one is not dominant (except V7)
     @rtype: Family
     """
-    return_families = []
 
-    for curr_family in families:
-        curr_family.determine_weight(curr_loop)
+    table = family_table(curr_loop.key['quality'], curr_loop.attributes['tritone'], final)
 
-        for _ in range(curr_family.weight):
-            return_families.append(families.index(curr_family))
+    return families[bisect_right(table, curr_loop.rng.randrange(table[-1]))]
 
-    return families[random.choice(return_families)]
 
-
-def choose_chord(curr_family, prev_chord):
+def choose_chord(curr_family, prev_chord, curr_loop):
     """Determines which chord from the family will be played based on the interval from the previous chord ~
     Used by block_chord() ~
 
@@ -142,6 +233,7 @@ def choose_chord(curr_family, prev_chord):
 
     @type curr_family: Family
     @type prev_chord: Chord
+    @type curr_loop: Loop
     @rtype: Chord
     """
     return_chords = []
@@ -168,4 +260,4 @@ def choose_chord(curr_family, prev_chord):
         for _ in range(add_val):
             return_chords.append(chord)
 
-    return random.choice(return_chords)
+    return curr_loop.rng.choice(return_chords)
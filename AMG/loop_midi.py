@@ -0,0 +1,153 @@
+"""Converts a written Loop or Song into a MidiFile, or the bytes of a Standard MIDI File, through its Timeline ~ """
+
+from class_timeline import *
+from midi_generation import combine_tracks
+from midi_encoding import *
+from mido import Message, MetaMessage, MidiTrack
+
+# MIDI channel of each part; every drum part is played on the General MIDI percussion channel
+part_channels = {'harm': 0, 'melody': 10, 'bass': 11, 'kick': 9, 'snare': 9, 'closed_hat': 9, 'open_hat': 9}
+
+# mido message type of each status of an event
+message_types = {NOTE_OFF: 'note_off', NOTE_ON: 'note_on', PROGRAM_CHANGE: 'program_change'}
+
+
+def choose_programs(rng):
+    """Returns the program (instrument) of each part, drawn from rng ~
+
+    @type rng: random.Random
+    @rtype: dict{str: int}
+    """
+
+    programs = {part: 0 for part in part_names}
+    programs['harm'] = rng.randint(41, 44)
+    programs['melody'] = rng.randint(81, 96)
+    programs['bass'] = rng.randint(33, 40)
+
+    return programs
+
+
+def timeline_parts(timeline, programs):
+    """Returns the events of one pass of each part of a Timeline, on the part's channel, and the pass' length ~
+
+    @type timeline: Timeline
+    @type programs: dict{str: int}
+    @rtype: list[(list[(int, int, int, int, int)], int)]
+        see timeline_events()
+    """
+
+    return [timeline_events(timeline.select(part), part_channels[part], programs[part]) for part in part_names]
+
+
+def events_track(events, length, loop_markers=False):
+    """Returns a MidiTrack of mido messages holding one pass of events ~
+    A pass whose last event comes before its end is padded with a silent note_off, such that repeats stay in time ~
+
+    @type events: list[(int, int, int, int, int)]
+    @type length: int
+    @type loop_markers: bool
+        if True, the pass is put between 'loopStart' and 'loopEnd' markers, for players which loop
+    @rtype: MidiTrack
+    """
+
+    track = MidiTrack()
+    prev_tick = 0
+
+    for tick, channel, status, data1, data2 in events:
+        if status == PROGRAM_CHANGE:
+            track.append(Message('program_change', channel=channel, program=data1, time=tick - prev_tick))
+            if loop_markers:
+                track.append(MetaMessage('marker', text='loopStart', time=0))
+        else:
+            track.append(Message(message_types[status], channel=channel, note=data1, velocity=data2,
+                                 time=tick - prev_tick))
+        prev_tick = tick
+
+    if loop_markers:
+        track.append(MetaMessage('marker', text='loopEnd', time=length - prev_tick))
+    elif length > prev_tick:
+        track.append(Message('note_off', channel=events[0][1], note=0, velocity=0, time=length - prev_tick))
+
+    return track
+
+
+def timeline_to_midi(timeline, programs, repeats=8, loop_markers=False):
+    """Returns a MidiFile of a Timeline, with one track per part ~
+    Every track holds one pass; the pass is repeated as the file is written (see midi_generation.write_midi()) ~
+
+    @type timeline: Timeline
+    @type programs: dict{str: int}
+    @type repeats: int
+        if loop_markers, the pass is played once
+    @type loop_markers: bool
+    @rtype: MidiFile
+    """
+
+    return combine_tracks([events_track(events, length, loop_markers)
+                           for events, length in timeline_parts(timeline, programs)],
+                          repeats=1 if loop_markers else repeats)
+
+
+def timeline_to_smf(timeline, programs, repeats=8, loop_markers=False):
+    """Returns the bytes of a Standard MIDI File of a Timeline, with one track per part ~
+
+    @type timeline: Timeline
+    @type programs: dict{str: int}
+    @type repeats: int
+    @type loop_markers: bool
+    @rtype: bytes
+    """
+
+    tracks = []
+
+    for events, length in timeline_parts(timeline, programs):
+        if loop_markers:
+            tracks.append(encode_track(events, length, [(0, 'loopStart'), (length, 'loopEnd')]))
+        else:
+            tracks.append(encode_track(repeated_events(events, length, repeats), length * repeats))
+
+    return encode_smf(tracks)
+
+
+def loop_to_midi(curr_loop, repeats=8, loop_markers=False, voice_leading=False):
+    """Returns a MidiFile of a written Loop (curr_loop); instruments are chosen with the Loop's own rng ~
+
+    @type curr_loop: Loop
+    @type repeats: int
+        times the Loop is played through; every track holds one pass, and repeats are only emitted when written by
+        midi_generation.write_midi()
+    @type loop_markers: bool
+        if True, the Loop is played once, between 'loopStart' and 'loopEnd' markers, for players which loop
+    @type voice_leading: bool
+        see Loop.to_events()
+    @rtype: MidiFile
+    """
+
+    return timeline_to_midi(curr_loop.to_events(voice_leading), choose_programs(curr_loop.rng), repeats, loop_markers)
+
+
+def loop_to_smf(curr_loop, repeats=8, loop_markers=False, voice_leading=False):
+    """Returns the bytes of a Standard MIDI File of a written Loop (curr_loop), encoded directly from its events ~
+    The file plays as loop_to_midi()'s does; instruments are chosen with the Loop's own rng ~
+
+    @type curr_loop: Loop
+    @type repeats: int
+    @type loop_markers: bool
+        if True, the Loop is played once, between 'loopStart' and 'loopEnd' markers, for players which loop
+    @type voice_leading: bool
+        see Loop.to_events()
+    @rtype: bytes
+    """
+
+    return timeline_to_smf(curr_loop.to_events(voice_leading), choose_programs(curr_loop.rng), repeats, loop_markers)
+
+
+def song_to_midi(curr_song):
+    """Returns a MidiFile of a written Song (curr_song), played once through; instruments are chosen with the Song's
+    own rng ~
+
+    @type curr_song: Song
+    @rtype: MidiFile
+    """
+
+    return timeline_to_midi(curr_song.to_events(), choose_programs(curr_song.rng), repeats=1)
@@ -5,10 +5,9 @@ import random
 import random
 import mido
 import pygame
-from midi_generation import generate_track, combine_tracks
+from loop_midi import loop_to_midi
+from midi_generation import midi_buffer, save_midi
 from playnotes import play_music
-from io import BytesIO
-import os
 import time
 
 
@@ -39,6 +38,13 @@ def run_amadeus():
     curr_loop = Loop(random.choice([2, 4, 8]), intensity)
     curr_loop.write_loop()
 
+    # Displaying the chord progression; pitches are only spelled as note names here
+    for curr_measure in curr_loop.harm['shell'].measures:
+        curr_chord = curr_measure.notes[0].value['chord']
+        print(get_chord_name(curr_chord, curr_loop),
+              ' '.join(spell_pitches(curr_measure.notes[0].value['voicing'], curr_chord, curr_loop)))
+    print()
+
     for output in [curr_loop.harm['passing'], curr_loop.melody['notes'], curr_loop.bass['notes']]:
         # print(output)
         pass
@@ -54,93 +60,11 @@ def run_amadeus():
 if __name__ == '__main__':
     loop = run_amadeus()
 
-    tracks = []
-
-    # displaying harmony output
-
-    # for line in harmony_note_objects(frame):
-    #     for notes in line:
-    #         for note in notes:
-    #             print(note)
-    #         print()
-
-    harmony_notes = loop.harm['final'].measures
-    melo_note_o_0 = loop.melody['final'].measures
-    new_bass_notes = loop.bass['final'].measures
-
-    flattened_0 = [val for val in harmony_notes]
-    flattened = []
-    for measure in flattened_0:
-        flattened.append(measure.notes)
-    # print(flattened)
-
-    melo_note_o_1 = [val for val in melo_note_o_0]
-    melo_note_o = []
-    for measure in melo_note_o_1:
-        melo_note_o.append(measure.notes)
-
-    for measure in flattened:
-        for i, chord in enumerate(measure):
-            new_chord = []
-            prev_char = ''
-            # print(chord.value)
-            for char in chord.value['voicing']:
-                if char == ' ':
-                    new_chord.append(Note(prev_char, chord.length, chord.index))
-                    prev_char = ''
-                else:
-                    prev_char += char
-            measure[i] = new_chord
-    # print(flattened)
-
-    for note in flattened:
-        for nott in note:
-            print(nott)
-    ordered = []
-    for i in range(len(flattened[0])):
-        line_seq = []
-        for line in flattened:
-            # print(i)
-            line_seq.append(line[i])
-        for note in line_seq:
-            print(note)
-        ordered.append(line_seq)
-
-    # simple drum pattern
-    drums = []
-    kicknote = Note('C', 1, 0)
-    hhnote = Note('Gb', 1, 0)
-    snarenote = Note('E', 1, 0)
-    drums = [kicknote, hhnote, snarenote, hhnote]
-    for i in range(0, 2):
-        drums.extend(drums)
-
-    # chosing instruments
-    chords_program = random.randint(41, 44)
-    melo_program = random.randint(81, 96)
-    bass_program = random.randint(33, 40)
-
-    # creating track
-    tracks.append(generate_track(drums, 9, octave=-2))
-    tracks.append(generate_track(melo_note_o, 10, program=melo_program, velocity=64))
-    tracks.append(generate_track(new_bass_notes, 11, octave=-3, program=bass_program, velocity=64))
-    for i, notes in enumerate(ordered):
-        for note in notes:
-            print(note)
-        print()
-        if i == 0:
-            tracks.append(generate_track(notes, i, octave=0, program=chords_program, velocity=45))
-        else:
-            tracks.append(generate_track(notes, i, octave=-1, program=chords_program, velocity=45))
-
-    # melody_notes = get_note_names(frame, loop, False)
-
     # combining and playing music
     print("combining")
-    melody_midi = combine_tracks(tracks)
+    melody_midi = loop_to_midi(loop)
     pygame.init()
-    melody_midi.save("melo.mid")
-    pygame.mixer.music.load("melo.mid")
+    pygame.mixer.music.load(midi_buffer(melody_midi), 'mid')  # played from memory; nothing is written until saved
 
     pygame.mixer.music.play()
     on = True
@@ -157,7 +81,7 @@ if __name__ == '__main__':
 
     if again == 'y':
         filename = input('what name you want to give to this dope ass beat: \n')
-        os.rename("melo.mid", filename)
+        save_midi(melody_midi, filename)
 
     again = input('again? (y/n) ')
 
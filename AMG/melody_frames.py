@@ -16,37 +16,71 @@ def construct_melody(curr_loop):
     """
 
     # First filling the rhythm Frame
-    for i, curr_measure in enumerate(curr_loop.melody['rhythm'].measures):
-        if i % 4 in [0, 3] or i == curr_loop.measures-1:  # AAAB CCCD EEEF etc pattern for rhythm repetition
-            assign_rests(curr_measure, curr_loop)
-            melody_rhythm(curr_measure, curr_loop)
-        else:
-            for i2, curr_note in enumerate(curr_measure.notes):
-                curr_note.value = curr_measure.prev.notes[i2].value
-
-    # Next filling the ints Frame
-    curr_loop.melody['ints'] = curr_loop.melody['rhythm'].extend().collapse(curr_loop)
-    for curr_measure in curr_loop.melody['ints'].measures:
-        melody_notes(curr_measure, curr_loop)
+    for i in range(curr_loop.measures):
+        melody_measure_rhythm(curr_loop, i)
+
+    # Next filling the ints and notes Frames
+    for i in range(curr_loop.measures):
+        melody_measure_notes(curr_loop, i)
+
+    finish_melody(curr_loop)
+
+
+def melody_measure_rhythm(curr_loop, i):
+    """Writes the rhythm of measure i of a Loop's (curr_loop) melody, once every measure before it has its rhythm ~
+    This is a mutating function ~
+
+    @type curr_loop: Loop
+    @type i: int
+    @rtype: None
+    """
+
+    curr_measure = curr_loop.melody['rhythm'].measures[i]
+
+    if i % 4 in [0, 3] or i == curr_loop.measures-1:  # AAAB CCCD EEEF etc pattern for rhythm repetition
+        assign_rests(curr_measure, curr_loop)
+        melody_rhythm(curr_measure, curr_loop)
+    else:
+        for i2, curr_note in enumerate(curr_measure.notes):
+            curr_note.value = curr_measure.prev.notes[i2].value
+
+
+def melody_measure_notes(curr_loop, i):
+    """Writes the ints and notes of measure i of a Loop's (curr_loop) melody ~
+    The rhythm of measure i and the one after it, and the passing chords of measure i, must already be written ~
+    This is a mutating function ~
+
+    @type curr_loop: Loop
+    @type i: int
+    @rtype: None
+    """
+
+    start = 8 * i
+    curr_loop.melody['rhythm'].index_rhythm(start, start + 8)
+
+    # Filling the ints Frame
+    curr_measure = curr_loop.melody['ints'].measures[i]
+    for curr_note, rhythm_note in zip(curr_measure.notes, curr_loop.melody['rhythm'].measures[i].notes):
+        curr_note.value = rhythm_note.value
+    melody_notes(curr_measure, curr_loop)
 
     # Filling the notes Frame
-    curr_loop.melody['notes'] = curr_loop.melody['ints'].extend().collapse(curr_loop)
-    for curr_measure in curr_loop.melody['notes'].measures:
-        for curr_note in curr_measure.notes:
-            if curr_loop.melody['rhythm'][curr_note.index] == 'S':  # sustained note
-                curr_note.value = curr_note.prev.value
+    for curr_note, ints_note in zip(curr_loop.melody['notes'].measures[i].notes, curr_measure.notes):
+        if ints_note.value == -1:  # rest
+            curr_note.value = None
+
+        else:  # new note / attack -> pitch class, where 0 is A
+            curr_chord = curr_loop.harm['passing'][curr_note.index].value['chord']
 
-            elif curr_note.value == -1:  # rest
-                curr_note.value = 'r'
+            curr_note.value = (get_tonic(curr_loop.key) + ints_note.value + curr_chord.interval) % 12
 
-            else:  # new note / attack
-                # print(curr_loop.harm['passing'])
-                curr_chord = curr_loop.harm['passing'][curr_note.index].value['chord']
 
-                tonic = key_sharp_or_flat(curr_loop.key).index(curr_loop.key['root'])
-                target = (tonic + curr_note.value + curr_chord.interval) % 12
+def finish_melody(curr_loop):
+    """Constructs the final compressed melody Frame of a Loop (curr_loop), once every measure is written ~
+    This is a mutating function ~
 
-                curr_note.value = chord_sharp_or_flat(curr_chord, curr_loop)[target]
+    @type curr_loop: Loop
+    @rtype: None
+    """
 
-    # Filling the final Frame
     curr_loop.melody['final'] = curr_loop.melody['notes'].compress()
@@ -1,7 +1,11 @@
 """Mutates Frame objects by adding melody values in integer form ~ """
 
 from functions import *
-import random
+from bisect import bisect_right
+from itertools import accumulate
+
+# (chord, depth >= 2, key quality) -> chord scale; each is built on first use
+chord_scales = {}
 
 
 def melody_notes(curr_measure, curr_loop):
@@ -17,114 +21,136 @@ def melody_notes(curr_measure, curr_loop):
         chord_scale = get_chord_scale(curr_loop.harm['passing'][i].value['chord'], curr_loop)
 
         if curr_note.value == 'A':
-            options = chord_scale['guide'] + chord_scale['shell'] + chord_scale['color']
-
-            # Guide tones should be strongest, followed by shell, then color tones are weak
-            if curr_note.index % 4 == 0:
-                for _ in range(2):
-                    options.extend(chord_scale['guide'])
-            elif curr_note.index % 2 == 0:
-                for _ in range(2):
-                    options.extend(chord_scale['shell'])
+            # The previous note is that of the last attack, as sustains only follow attacks or sustains
+            prev_attack = curr_loop.melody['rhythm'].prev_attacks[curr_note.index]
+            if prev_attack is None:  # this is the first note of the loop, i.e. there is no prev note
+                prev_value = None
             else:
-                for _ in range(2):
-                    options.extend(chord_scale['color'])
+                prev_value = curr_loop.melody['ints'][prev_attack].value
 
-            # Give huge preference to notes closer to previous note
-            prev_notes = [this.value for this in
-                          curr_loop.melody['rhythm'].extend().measures[0].notes[:curr_note.index]]
-            if 'A' in prev_notes:
-                first_note = False
-            else:  # as there are no previous attacks, this is the first note of the loop, i.e. there is no prev note
-                first_note = True
+            # Color tones should be avoided before rests
+            delete = curr_loop.melody['rhythm'].next_events[curr_note.index] == 'R'
 
-            if not first_note:
-                prev_note = curr_loop.melody['rhythm'][curr_note.index].prev
+            table = list(accumulate(melody_weights(chord_scale, curr_note.index, prev_value, delete)))
+            curr_note.value = bisect_right(table, curr_loop.rng.randrange(table[-1]))
 
-                while prev_note.value == 'R':
-                    prev_note = prev_note.prev
+        elif curr_note.value == 'S':
+            curr_note.value = curr_note.prev.value
 
-                prev_note = curr_loop.melody['ints'][prev_note.index]
+        else:  # curr_note.value == 'R'
+            curr_note.value = -1
 
-                for next_note in chord_scale['guide'] + chord_scale['shell'] + chord_scale['color']:
-                    if prev_note.value == next_note:
-                        continue
 
-                    delta = min([abs(prev_note.value - next_note), 12-abs(prev_note.value - next_note)])
+def melody_weights(chord_scale, index, prev_value, before_rest):
+    """Returns how strongly each pitch (relative to the chord) is preferred for a melody attack ~
+    Used by melody_notes() ~
 
-                    for _ in range((5 - delta) ** 2):
-                        options.append(next_note)
+    Drawing a pitch in proportion to these weights is exactly drawing from a list holding each pitch (weight) times ~
 
-            # Color tones should be avoided before rests
-            next_notes = [this for this in curr_loop.melody['rhythm'].extend().measures[0].notes[curr_note.index+1:]]
-            delete = False
-            for next_note in next_notes:
-                if next_note is None:
-                    delete = True
-                    break
-                elif next_note.value == 'R':
-                    delete = True
-                    break
-                elif next_note.value == 'A':
-                    delete = False
-                    break
-
-            if delete:
-                for color_tone in chord_scale['color']:
-                    while color_tone in options:
-                        options.remove(color_tone)
-                options.extend(chord_scale['color'])  # so that there is still a small chance of color tone here
-
-            curr_note.value = random.choice(options)
+    @type chord_scale: dictionary {'guide': (4, 11), ...}
+    @type index: int
+        index of the attack in the Loop
+    @type prev_value: int | None
+        the previous melody note, or None if this is the first attack of the loop
+    @type before_rest: bool
+        whether a rest follows before the next attack
+    @rtype: list[int]
+        12 weights, one per pitch where 0 is the root of the chord
+    """
 
-        elif curr_note.value == 'S':
-            curr_note.value = curr_note.prev.value
+    weights = [0] * 12
 
-        else:  # curr_note.value == 'R'
-            curr_note.value = -1
+    for tone in chord_scale['tones']:
+        weights[tone] += 1
+
+    # Guide tones should be strongest, followed by shell, then color tones are weak
+    if index % 4 == 0:
+        strong_tones = chord_scale['guide']
+    elif index % 2 == 0:
+        strong_tones = chord_scale['shell']
+    else:
+        strong_tones = chord_scale['color']
+
+    for tone in strong_tones:
+        weights[tone] += 2
+
+    # Give huge preference to notes closer to previous note
+    if prev_value is not None:
+        for tone in chord_scale['tones']:
+            if tone != prev_value:
+                weights[tone] += (5 - pitch_distances[prev_value][tone]) ** 2
+
+    # Color tones should be avoided before rests, though there is still a small chance of them
+    if before_rest:
+        for tone in chord_scale['color']:
+            weights[tone] = 1
+
+    return weights
 
 
 def get_chord_scale(curr_chord, curr_loop):
-    """Takes a chord and returns its guide tones, shell notes, and color tones
+    """Takes a chord and returns its guide tones, shell notes, and color tones ~
+    Chord scales are immutable and built once per (chord, depth >= 2, key quality); see chord_scales ~
 
     @type curr_chord: Chord
     @type curr_loop: Loop
-    @rtype: dictionary {'guide': [0, 7], ...}
+    @rtype: dictionary {'guide': (4, 11), ...}
+        'tones' holds guide, shell and color tones in that order; 'bass' holds the bass' weighted choices
     """
 
-    chord_scale = {'guide': [], 'shell': [], 'color': []}
+    key = (curr_chord, curr_loop.attributes['depth'] >= 2, curr_loop.key['quality'])
+    chord_scale = chord_scales.get(key)
+
+    if chord_scale is None:
+        chord_scale = build_chord_scale(*key)
+        chord_scales[key] = chord_scale
+
+    return chord_scale
+
+
+def build_chord_scale(curr_chord, deep, key_quality):
+    """Works out the guide tones, shell notes, and color tones of a chord ~
+    Used by get_chord_scale() ~
+
+    @type curr_chord: Chord
+    @type deep: bool
+        whether the Loop's depth is 2 or more
+    @type key_quality: str
+    @rtype: dictionary {'guide': (4, 11), ...}
+    """
 
     if curr_chord.quality == 'major':
-        chord_scale['guide'] = [4, 11]
-        chord_scale['shell'] = [0, 7]
-        chord_scale['color'] = [2, 6, 9]
+        guide = (4, 11)
+        shell = (0, 7)
+        color = (2, 6, 9)
 
         if curr_chord.name == 'Imaj':
-            chord_scale['color'].remove(6)
-        if curr_loop.attributes['depth'] >= 2:
-            chord_scale['shell'].remove(0)
+            color = (2, 9)
+        if deep:
+            shell = (7,)
 
     elif curr_chord.quality == 'minor':
-        chord_scale['guide'] = [3, 10]
-        chord_scale['shell'] = [0, 7]
-        chord_scale['color'] = [2, 5, 9]
+        guide = (3, 10)
+        shell = (0, 7)
+        color = (2, 5, 9)
 
         if curr_chord.name in ['II-', 'relII-', 'V-', 'I-']:
-            chord_scale['color'].remove(9)
+            color = (2, 5)
         if curr_chord.name == 'III-':
-            chord_scale['color'].remove(2)
+            color = (5, 9)
         if curr_chord.name == 'relII-7b5':
-            chord_scale['shell'][1] = 6
-            chord_scale['color'] = [5, 8]
+            shell = (0, 6)
+            color = (5, 8)
 
-    else:  # full_chords[spots.index(spot)].quality == 'dominant'
-        chord_scale['guide'] = [4, 10]
-        chord_scale['shell'] = [0, 7]
-        chord_scale['color'] = [2, 9]
+    else:  # curr_chord.quality == 'dominant'
+        guide = (4, 10)
+        shell = (0, 7)
+        color = (2, 9)
 
         if curr_chord.name == 'V7/II':
-            chord_scale['color'] = [2, 8]
-        elif curr_chord.name in ['V7/III', 'V7/VI'] or curr_chord.name == 'V7' and curr_loop.key['quality'] == 'minor':
-            chord_scale['color'] = [1, 3, 8]
+            color = (2, 8)
+        elif curr_chord.name in ['V7/III', 'V7/VI'] or curr_chord.name == 'V7' and key_quality == 'minor':
+            color = (1, 3, 8)
 
-    return chord_scale
+    return {'guide': guide, 'shell': shell, 'color': color, 'tones': guide + shell + color,
+            'bass': shell + shell + guide + color}
@@ -1,41 +1,178 @@
 """Contains rhythm algorithms for melody and bass ~ """
 
-import random
+from itertools import product
+
+# tuple(rhythm_ref) -> (rest patterns, cumulative probabilities); each table is built on first use, or by
+# build_rest_tables()
+rest_tables = {}
+
+# Most salient steps a rhythm_ref has; see Loop.create_rhythm_ref()
+MAX_SALIENT = 4
 
 
 def assign_rests(curr_measure, curr_loop):
     """Assigns rests for a 4/4 measure ~
     This is a mutating function ~
 
+    The rests are drawn in one go from rest_table(curr_loop.rhythm_ref); see rest_pass() for how they are placed ~
+
     @type curr_loop: Loop
     @type curr_measure: Measure
     @rtype: None
     """
 
-    rest_amount = random.randint(0, 3)
-    rest_count = 0
+    patterns, cumulative = rest_table(curr_loop.rhythm_ref)
+    pattern = curr_loop.rng.choices(patterns, cum_weights=cumulative)[0]
+
+    for i, curr_note in enumerate(curr_measure.notes):
+        if pattern & (1 << i):
+            curr_note.value = 'R'
+
+
+def rest_table(rhythm_ref):
+    """Returns every possible rest pattern of an empty measure for a rhythm_ref, with cumulative probabilities ~
+    Tables are immutable and built once per rhythm_ref; see rest_tables ~
+
+    @type rhythm_ref: list[int]
+    @rtype: ((int, ...), (float, ...))
+        rest patterns, as bit masks where bit i marks a rest on note i, and their cumulative probabilities
+    """
+
+    key = tuple(rhythm_ref)
+    table = rest_tables.get(key)
+
+    if table is None:
+        chances = {}
+
+        # Between 0 and 3 rests are asked for, each as likely as the other
+        for rest_amount in range(4):
+            for pattern, chance in rest_outcomes(key, 0, 0, rest_amount, {}).items():
+                chances[pattern] = chances.get(pattern, 0) + chance / 4
+
+        patterns = tuple(sorted(chances))
+        cumulative = []
+        total = 0
+        for pattern in patterns:
+            total += chances[pattern]
+            cumulative.append(total)
+
+        table = (patterns, tuple(cumulative))
+        rest_tables[key] = table
+
+    return table
+
+
+def build_rest_tables():
+    """Builds the rest table of every rhythm_ref a Loop may have, such that no Loop written afterwards waits on one ~
+    A table costs up to about 80 ms to build, and all of them about 1 s; processes which write many Loops, or must
+    write each one quickly, call this once before they start ~
+
+    @rtype: None
+    """
+
+    for rhythm_ref in product((0, 1), repeat=8):
+        if sum(rhythm_ref) <= MAX_SALIENT:
+            rest_table(rhythm_ref)
+
+
+def rest_outcomes(rhythm_ref, pattern, rest_count, rest_amount, memo):
+    """Returns the chance of each final rest pattern, when passes over the measure start from pattern ~
+
+    Passes repeat until rest_amount rests have been counted; a pass which adds no rest leaves everything as it was,
+    so it is factored out rather than repeated ~
+
+    @type rhythm_ref: (int, ...)
+    @type pattern: int
+    @type rest_count: int
+    @type rest_amount: int
+    @type memo: dict{(int, int): dict{int: float}}
+    @rtype: dict{int: float}
+    """
+
+    if rest_count >= rest_amount:
+        return {pattern: 1.0}
+
+    if (pattern, rest_count) in memo:
+        return memo[(pattern, rest_count)]
+
+    finished = {}
+    unfinished = {}
+    repeat = 0.0
+
+    for (new_pattern, new_count, done), chance in rest_pass(rhythm_ref, pattern, rest_count, rest_amount).items():
+        if done or new_count > rest_amount:
+            finished[new_pattern] = finished.get(new_pattern, 0) + chance
+        elif new_count == rest_count:
+            repeat += chance
+        else:
+            unfinished[(new_pattern, new_count)] = chance
+
+    # A pass which can never add a rest would repeat forever; leave the measure as it is
+    if repeat >= 1.0:
+        return {pattern: 1.0}
+
+    outcomes = {}
+    for new_pattern, chance in finished.items():
+        outcomes[new_pattern] = outcomes.get(new_pattern, 0) + chance / (1 - repeat)
+    for (new_pattern, new_count), chance in unfinished.items():
+        for final_pattern, final_chance in rest_outcomes(rhythm_ref, new_pattern, new_count, rest_amount,
+                                                         memo).items():
+            outcomes[final_pattern] = outcomes.get(final_pattern, 0) + chance * final_chance / (1 - repeat)
+
+    memo[(pattern, rest_count)] = outcomes
+    return outcomes
+
+
+def rest_pass(rhythm_ref, pattern, rest_count, rest_amount):
+    """Returns the chance of each state after one pass over the notes of a measure ~
+
+    At each note:
+        i) a note which is not a rest, and is not marked 'salient' by rhythm_ref, becomes a rest with chance 1/11
+        ii) if the note is a rest, the next note becomes a rest with chance 1/5 * 2/3 (if it is not salient)
+        iii) if the note is a rest, the previous note becomes a rest with chance 1/5 * 2/3 (if it is not salient)
+        iv) the pass stops once exactly rest_amount rests have been counted
+    Every rest placed is counted, even when the note already was a rest ~
+
+    @type rhythm_ref: (int, ...)
+    @type pattern: int
+    @type rest_count: int
+    @type rest_amount: int
+    @rtype: dict{(int, int, bool): float}
+        (pattern, rest_count, whether the pass stopped early) -> chance
+    """
+
+    states = {(pattern, rest_count, False): 1.0}
+
+    for i in range(8):
+        new_states = {}
+
+        for (curr_pattern, curr_count, done), chance in states.items():
+            branches = [(curr_pattern, curr_count, chance)]
 
-    while rest_count < rest_amount:
-        for i, curr_note in enumerate(curr_measure.notes):
+            if not done:
+                if not curr_pattern & (1 << i) and rhythm_ref[i] != 1:
+                    branches = [(curr_pattern, curr_count, chance * 10 / 11),
+                                (curr_pattern | (1 << i), curr_count + 1, chance / 11)]
 
-            # Adding rests at random positions, if the position is not marked 'salient' by rhythm_ref
-            if curr_note.value is None and random.randint(0, 10) == 0 and curr_loop.rhythm_ref[i] != 1:
-                curr_note.value = 'R'
-                rest_count += 1
+                for neighbour in [i + 1, i - 1]:
+                    if 0 <= neighbour < 8 and rhythm_ref[neighbour] != 1:
+                        extended = []
+                        for branch_pattern, branch_count, branch_chance in branches:
+                            if branch_pattern & (1 << i):
+                                extended.append((branch_pattern, branch_count, branch_chance * 13 / 15))
+                                extended.append((branch_pattern | (1 << neighbour), branch_count + 1,
+                                                 branch_chance * 2 / 15))
+                            else:
+                                extended.append((branch_pattern, branch_count, branch_chance))
+                        branches = extended
 
-            # Adding rests adjacent to rests already added
-            if curr_note.value == 'R' and random.randint(0, 4) == 0 and i != len(curr_measure.notes)-1:
-                if curr_loop.rhythm_ref[i+1] != 1 and random.randint(0, 2) > 0:
-                    curr_note.next.value = 'R'
-                    rest_count += 1
+            for branch_pattern, branch_count, branch_chance in branches:
+                state = (branch_pattern, branch_count, done or branch_count == rest_amount)
+                new_states[state] = new_states.get(state, 0) + branch_chance
 
-            if curr_note.value == 'R' and random.randint(0, 4) == 0 and i != 0:
-                if curr_loop.rhythm_ref[i-1] != 1 and random.randint(0, 2) > 0:
-                    curr_note.prev.value = 'R'
-                    rest_count += 1
+        states = new_states
 
-            if rest_count == rest_amount:
-                return
+    return states
 
 
 def melody_rhythm(curr_measure, curr_loop):
@@ -59,7 +196,7 @@ def melody_rhythm(curr_measure, curr_loop):
                 curr_note.value = 'A'
 
             # Spots marked 'salient' by rhythm_ref have high chance to be attack
-            elif curr_loop.rhythm_ref[i] == 1 and random.randint(0, 2) != 0:
+            elif curr_loop.rhythm_ref[i] == 1 and curr_loop.rng.randint(0, 2) != 0:
                 curr_note.value = 'A'
 
             # Everything else is sustain
@@ -0,0 +1,39 @@
+"""Reports the memory held by written Loops ~
+
+Run directly to print the average number of bytes retained per Loop ~
+"""
+
+from class_loop import *
+import gc
+import tracemalloc
+
+
+def bytes_per_loop(count, measures, intensity):
+    """Writes count Loops, keeps them all alive, and returns the average bytes allocated per Loop ~
+
+    @type count: int
+    @type measures: int
+    @type intensity: int
+    @rtype: float
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    loops = []
+    for i in range(count):
+        curr_loop = Loop(measures, intensity, seed=i)
+        curr_loop.write_loop()
+        loops.append(curr_loop)
+
+    gc.collect()
+    total = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    return total / count
+
+
+if __name__ == '__main__':
+    for length in [2, 4, 8]:
+        print('{} measures: {:,.0f} bytes per Loop'.format(length, bytes_per_loop(200, length, 2)))
@@ -0,0 +1,158 @@
+"""Encodes Standard MIDI Files directly from compact event lists, without building a mido Message per event ~
+
+An event is a tuple (tick, channel, status, data1, data2), where tick is absolute and status is one of NOTE_OFF,
+NOTE_ON, or PROGRAM_CHANGE (data1 is the program, and data2 is ignored). Events of a track must be in tick order ~
+"""
+
+import numpy as np
+
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+PROGRAM_CHANGE = 0xC0
+
+# Ticks per step (eighth note), as in generate_track()
+STEP_TICKS = 512
+
+
+def encode_vlq(value, data):
+    """Appends a non-negative int to data as a MIDI variable-length quantity ~
+
+    @type value: int
+    @type data: bytearray
+    @rtype: None
+    """
+
+    if value < 0x80:
+        data.append(value)
+        return
+
+    groups = [value & 0x7F]
+    value >>= 7
+    while value:
+        groups.append(0x80 | (value & 0x7F))
+        value >>= 7
+
+    data.extend(reversed(groups))
+
+
+def encode_track(events, length=None, markers=()):
+    """Returns one MTrk chunk holding events, using running status ~
+
+    @type events: iterable((int, int, int, int, int))
+    @type length: int | None
+        tick at which the track ends; if None, it ends with its last event
+    @type markers: list[(int, str)]
+        (tick, text) of marker meta events, in tick order; each is written after the channel events at its tick
+    @rtype: bytes
+    """
+
+    data = bytearray()
+    markers = list(markers)
+    marker_index = 0
+    prev_tick = 0
+    running_status = None
+
+    for tick, channel, status, data1, data2 in events:
+        while marker_index < len(markers) and markers[marker_index][0] < tick:
+            prev_tick, running_status = encode_marker(markers[marker_index], prev_tick, data)
+            marker_index += 1
+
+        encode_vlq(tick - prev_tick, data)
+        prev_tick = tick
+
+        status_byte = status | channel
+        if status_byte != running_status:
+            data.append(status_byte)
+            running_status = status_byte
+
+        data.append(data1)
+        if status != PROGRAM_CHANGE:
+            data.append(data2)
+
+    for marker in markers[marker_index:]:
+        prev_tick, running_status = encode_marker(marker, prev_tick, data)
+
+    # End of track
+    if length is None or length < prev_tick:
+        length = prev_tick
+    encode_vlq(length - prev_tick, data)
+    data.extend(b'\xff\x2f\x00')
+
+    return b'MTrk' + len(data).to_bytes(4, 'big') + data
+
+
+def encode_marker(marker, prev_tick, data):
+    """Appends a marker meta event to data; used by encode_track() ~
+    Meta events cancel running status ~
+
+    @type marker: (int, str)
+    @type prev_tick: int
+    @type data: bytearray
+    @rtype: (int, None)
+        the tick of the marker, and the running status after it
+    """
+
+    tick, text = marker
+    text = text.encode('latin-1')
+
+    encode_vlq(tick - prev_tick, data)
+    data.extend(b'\xff\x06')
+    encode_vlq(len(text), data)
+    data.extend(text)
+
+    return tick, None
+
+
+def encode_smf(tracks, ticks_per_beat=480):
+    """Returns a type 1 Standard MIDI File holding already encoded tracks ~
+
+    @type tracks: list[bytes]
+        see encode_track()
+    @type ticks_per_beat: int
+    @rtype: bytes
+    """
+
+    header = b'MThd' + (6).to_bytes(4, 'big') + (1).to_bytes(2, 'big') + len(tracks).to_bytes(2, 'big') + \
+        ticks_per_beat.to_bytes(2, 'big')
+
+    return header + b''.join(tracks)
+
+
+def timeline_events(timeline, channel, program=0):
+    """Returns the events of one pass of a Timeline, all on one channel, and the pass' length ~
+    Each note is attacked on its onset and released when it ends; a release comes before an attack at the same tick ~
+
+    @type timeline: Timeline
+        usually holding a single part; see Timeline.select()
+    @type channel: int
+    @type program: int
+    @rtype: (list[(int, int, int, int, int)], int)
+    """
+
+    ticks = np.concatenate([timeline.onset, timeline.onset + timeline.duration]) * STEP_TICKS
+    statuses = np.repeat([NOTE_ON, NOTE_OFF], len(timeline))
+    order = np.lexsort((statuses, ticks))
+
+    events = [(0, channel, PROGRAM_CHANGE, program, 0)]
+    events.extend(zip(ticks[order].tolist(), [channel] * len(order), statuses[order].tolist(),
+                      np.tile(timeline.pitch, 2)[order].tolist(), np.tile(timeline.velocity, 2)[order].tolist()))
+
+    return events, timeline.length * STEP_TICKS
+
+
+def repeated_events(events, length, repeats):
+    """Yields the events of a pass (repeats) times over, each pass length ticks after the last ~
+    The program change at the start of the pass is only yielded once ~
+
+    @type events: list[(int, int, int, int, int)]
+    @type length: int
+    @type repeats: int
+    @rtype: generator((int, int, int, int, int))
+    """
+
+    for repeat in range(repeats):
+        offset = repeat * length
+        for tick, channel, status, data1, data2 in events:
+            if status == PROGRAM_CHANGE and repeat > 0:
+                continue
+            yield tick + offset, channel, status, data1, data2
@@ -1,6 +1,10 @@
 import mido
-from mido import MidiFile, MidiTrack, Message
+from mido import MidiFile, MidiTrack, Message, MetaMessage
 from time import sleep
+from io import BytesIO
+from itertools import chain, repeat
+import os
+import uuid
 notes_flat = ['A', 'Bb', 'B', 'C', 'Db', 'D', 'Eb', 'E', 'F', 'Gb', 'G', 'Ab']
 notes_sharp = ['A', 'A#', 'B', 'C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#']
 drum_beats = ['Kick', 'Snare', 'HH']
@@ -16,45 +20,88 @@ for i, note in enumerate(notes_sharp):
 Midi_Dict.update(Sharp_Dict)
 Midi_Dict['Rest'] = 0
 
+def midi_number(value):
+	"""Note values may be pitch classes (0 is A, as in notes_flat), note names, or None / 'Rest' for a rest"""
+	if value is None:
+		return Midi_Dict['Rest']
+	if isinstance(value, int):
+		return 57 + value
+	return Midi_Dict[value]
+
 def find_closest(past, next):
+	"""Moves next by octaves to within a tritone of past (up if below past, down if above), then into [60, 84] ~
+	Closed form of stepping by octaves; registers.closest_pitches() is the same for whole arrays"""
 	if past >= next:
-		while(True):
-			if abs(past - next) > 6:
-				next += 12
-			else: break
+		next += 12 * ((past - next + 5) // 12)
 	else:
-		while(True):
-			if abs(next - past) > 6:
-				next -= 12
-			else: break
-	while(True):
-		if next < 60: #middle C two octaves
-			next += 12
-		elif next > 84:
-			next -= 12
-		else:
-			return next
+		next -= 12 * ((next - past + 5) // 12)
+	if next < 60: #middle C two octaves
+		next += 12 * ((71 - next) // 12)
+	elif next > 84:
+		next -= 12 * ((next - 73) // 12)
+	return next
 
 
-def generate_track(note_array, channel, octave=0, program=0, velocity = 64, drums = False):
-	from amg import Note
+def generate_track(note_array, channel, octave=0, program=0, velocity = 64, drums = False, loop_markers = False):
+	"""Builds a track from one pass of note_array; combine_tracks() sets how many times the pass is played. With
+	loop_markers, the pass is put between 'loopStart' and 'loopEnd' marker meta messages for players which loop"""
 	time = 512
 	track = MidiTrack()
-	pastnote = Midi_Dict[note_array[0].value]
+	pastnote = midi_number(note_array[0].value)
 	track.append(Message('program_change', program = program, channel = channel))
+	if loop_markers:
+		track.append(MetaMessage('marker', text='loopStart', time=0))
 	for note in note_array:
-		if note.value == 'Rest':
-			track.append(Message('note_on', channel=channel, note=Midi_Dict[note.value] + octave * 12, velocity=0, time=1))
-			track.append(Message('note_off', channel=channel, note=Midi_Dict[note.value] + octave * 12, velocity=0, time=time*note.length))
+		if note.value is None or note.value == 'Rest':
+			track.append(Message('note_on', channel=channel, note=midi_number(None), velocity=0, time=1))
+			track.append(Message('note_off', channel=channel, note=midi_number(None), velocity=0, time=time*note.length))
 		else:
-			pastnote = find_closest(pastnote, Midi_Dict[note.value])
+			pastnote = find_closest(pastnote, midi_number(note.value))
 			track.append(Message('note_on', channel=channel, note=pastnote + (octave * 12), velocity = velocity, time=1))
 			track.append(Message('note_off', channel=channel, note=pastnote + (octave * 12), velocity=velocity, time=time*note.length))
-	track += track *7
+	if loop_markers:
+		track.append(MetaMessage('marker', text='loopEnd', time=0))
 	return track
 
-def combine_tracks(track_array):
+def combine_tracks(track_array, repeats=1):
+	"""Returns a MidiFile of tracks which each hold one pass, played (repeats) times when written by write_midi()"""
 	mid = MidiFile(type=1)
 	for track in track_array:
 		mid.tracks.append(track)
-	return mid
\ No newline at end of file
+	mid.repeats = repeats
+	return mid
+
+def write_midi(mid, file):
+	"""Writes a MidiFile to an open binary file, every track played (mid.repeats) times over ~
+	This is the only place repeats are expanded: each track is written from its one pass (repeats) times in turn,
+	such that repeated messages are never built or kept in memory"""
+	repeats = getattr(mid, 'repeats', 1)
+	if repeats != 1:
+		mid = MidiFile(type=mid.type, ticks_per_beat=mid.ticks_per_beat, charset=mid.charset,
+		               tracks=[chain.from_iterable(repeat(track, repeats)) for track in mid.tracks])
+	mid.save(file=file)
+
+def midi_buffer(mid):
+	"""Returns a MidiFile serialised into a BytesIO by write_midi(), rewound to its start; nothing is written to disk"""
+	buffer = BytesIO()
+	write_midi(mid, buffer)
+	buffer.seek(0)
+	return buffer
+
+def save_midi(mid, filename):
+	"""Writes a MidiFile, or the bytes of an encoded one, to filename atomically: it is written to a temporary file
+	beside filename, then renamed over it, such that filename never holds a partly written file, and concurrent
+	writers never share a file"""
+	directory, name = os.path.split(os.path.abspath(filename))
+	temp_name = os.path.join(directory, '.{}.{}.tmp'.format(name, uuid.uuid4().hex))
+	try:
+		with open(temp_name, 'xb') as temp_file:
+			if isinstance(mid, (bytes, bytearray)):
+				temp_file.write(mid)
+			else:
+				write_midi(mid, temp_file)
+		os.replace(temp_name, filename)
+	except BaseException:
+		if os.path.exists(temp_name):
+			os.unlink(temp_name)
+		raise
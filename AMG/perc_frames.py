@@ -13,34 +13,47 @@ def construct_percussion(curr_loop):
     @rtype: None
     """
 
+    for i in range(curr_loop.measures):
+        percussion_measure(curr_loop, i)
+
+
+def percussion_measure(curr_loop, i):
+    """Fills measure i of every percussion Frame of a Loop (curr_loop), once the first measure is filled ~
+    Each instrument is either written anew, or repeats the first measure ~
+
+    @type curr_loop: Loop
+    @type i: int
+    @rtype: None
+    """
+
     # Fill kick Frame
-    for i, curr_measure in enumerate(curr_loop.perc['kick'].measures):
-        if i == 0 or i == curr_loop.measures-1 or (i+1) == (curr_loop.measures/2) and random.randint(0, 1) == 0:
-            write_kicks(curr_measure, curr_loop)
-        else:
-            for i2, curr_note in enumerate(curr_loop.perc['kick'].measures[0].notes):
-                curr_measure.notes[i2].value = curr_note.value
+    curr_measure = curr_loop.perc['kick'].measures[i]
+    if i == 0 or i == curr_loop.measures-1 or (i+1) == (curr_loop.measures/2) and curr_loop.rng.randint(0, 1) == 0:
+        write_kicks(curr_measure, curr_loop)
+    else:
+        for i2, curr_note in enumerate(curr_loop.perc['kick'].measures[0].notes):
+            curr_measure.notes[i2].value = curr_note.value
 
     # Fill snare Frame
-    for i, curr_measure in enumerate(curr_loop.perc['snare'].measures):
-        if i == 0 or i == curr_loop.measures - 1 or (i+1) == (curr_loop.measures/2) and random.randint(0, 1) == 0:
-            write_snares(curr_measure)
-        else:
-            for i2, curr_note in enumerate(curr_loop.perc['snare'].measures[0].notes):
-                curr_measure.notes[i2].value = curr_note.value
+    curr_measure = curr_loop.perc['snare'].measures[i]
+    if i == 0 or i == curr_loop.measures - 1 or (i+1) == (curr_loop.measures/2) and curr_loop.rng.randint(0, 1) == 0:
+        write_snares(curr_measure)
+    else:
+        for i2, curr_note in enumerate(curr_loop.perc['snare'].measures[0].notes):
+            curr_measure.notes[i2].value = curr_note.value
 
     # Fill closed_hat Frame
-    for i, curr_measure in enumerate(curr_loop.perc['closed_hat'].measures):
-        if i == 0 or i == curr_loop.measures - 1 or (i+1) == (curr_loop.measures/2) and random.randint(0, 1) == 0:
-            write_closed_hats(curr_measure)
-        else:
-            for i2, curr_note in enumerate(curr_loop.perc['closed_hat'].measures[0].notes):
-                curr_measure.notes[i2].value = curr_note.value
+    curr_measure = curr_loop.perc['closed_hat'].measures[i]
+    if i == 0 or i == curr_loop.measures - 1 or (i+1) == (curr_loop.measures/2) and curr_loop.rng.randint(0, 1) == 0:
+        write_closed_hats(curr_measure, curr_loop)
+    else:
+        for i2, curr_note in enumerate(curr_loop.perc['closed_hat'].measures[0].notes):
+            curr_measure.notes[i2].value = curr_note.value
 
     # Fill open_hat Frame
-    for i, curr_measure in enumerate(curr_loop.perc['open_hat'].measures):
-        if i == 0 or i == curr_loop.measures - 1 or (i + 1) == (curr_loop.measures / 2) and random.randint(0, 1) == 0:
-            write_open_hats(curr_measure, curr_loop)
-        else:
-            for i2, curr_note in enumerate(curr_loop.perc['open_hat'].measures[0].notes):
-                curr_measure.notes[i2].value = curr_note.value
+    curr_measure = curr_loop.perc['open_hat'].measures[i]
+    if i == 0 or i == curr_loop.measures - 1 or (i + 1) == (curr_loop.measures / 2) and curr_loop.rng.randint(0, 1) == 0:
+        write_open_hats(curr_measure, curr_loop)
+    else:
+        for i2, curr_note in enumerate(curr_loop.perc['open_hat'].measures[0].notes):
+            curr_measure.notes[i2].value = curr_note.value
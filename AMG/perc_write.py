@@ -1,7 +1,5 @@
 """Contains code for percussion"""
 
-import random
-
 
 def write_kicks(curr_measure, curr_loop):
     """Writes the kicks for a standard measure in Frame object 'curr_frame'
@@ -20,7 +18,7 @@ def write_kicks(curr_measure, curr_loop):
 
         if count == 0 or count == 4:
             kicks[count] = 1
-        elif count != 2 and count != 6 and random.randint(0, add_val) < 2:
+        elif count != 2 and count != 6 and curr_loop.rng.randint(0, add_val) < 2:
             kicks[count] = 1
 
     for i, kick in enumerate(kicks):
@@ -43,22 +41,23 @@ def write_snares(curr_measure):
             curr_note.value = 'rest'
 
 
-def write_closed_hats(curr_measure):
+def write_closed_hats(curr_measure, curr_loop):
     """Writes the closed hats for a standard measure in Frame object 'curr_frame'
 
     @type curr_measure: Measure
+    @type curr_loop: Loop
     @rtype: None
     """
     hats = [10, 20, 30, 40, 50, 60, 70, 80]  # dummy values
 
-    if random.randint(0, 1) == 0:
+    if curr_loop.rng.randint(0, 1) == 0:
         for i in range(0, 8, 2):
             hats[i] = 1
     else:
         for i in range(1, 9, 2):
             hats[i] = 1
 
-    if random.randint(0, 2) == 0:
+    if curr_loop.rng.randint(0, 2) == 0:
         hats = [1, 1, 1, 1, 1, 1, 1, 1]
 
     for i, hat in enumerate(hats):
@@ -77,14 +76,14 @@ def write_open_hats(curr_measure, curr_loop):
     """
     hats = [10, 20, 30, 40, 50, 60, 70, 80]  # dummy values
 
-    if random.randint(0, 4) < 2:
-        hats[random.choice([0, 3, 4, 7])] = 1
-    elif random.randint(0, 4) < 2:
+    if curr_loop.rng.randint(0, 4) < 2:
+        hats[curr_loop.rng.choice([0, 3, 4, 7])] = 1
+    elif curr_loop.rng.randint(0, 4) < 2:
         indices = []
         for i, hit in enumerate(curr_loop.rhythm_ref):
             if hit == 1:
                 indices.append(i)
-        hats[random.choice(indices)] = 1
+        hats[curr_loop.rng.choice(indices)] = 1
 
     for i, hat in enumerate(hats):
         if hat == 1:
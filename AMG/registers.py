@@ -0,0 +1,104 @@
+"""Assigns registers (MIDI note numbers) to whole voices at once with NumPy ~
+
+Each note of a voice is placed as find_closest() places it: within a tritone of the voice's previous note, then moved
+by octaves into [60, 84]. As each note depends on the one before it, voices are stepped through together, one note of
+every voice at a time, such that no loop runs per note of each voice ~
+"""
+
+import numpy as np
+
+REST = -1
+
+LOWEST = 60
+HIGHEST = 84
+
+# Every register a placed note may take
+register_range = np.arange(LOWEST, HIGHEST + 1)
+
+
+def closest_pitches(past, pitches):
+    """Returns each pitch moved by octaves to within a tritone of past, then into [60, 84], as find_closest() does ~
+    Works elementwise, broadcasting past against pitches ~
+
+    Below past, a pitch is raised until at most 6 semi-tones below it; above past, it is lowered until at most 6
+    semi-tones above it ~
+
+    @type past: int | np.ndarray
+    @type pitches: int | np.ndarray
+    @rtype: np.ndarray
+    """
+
+    delta = np.asarray(past) - pitches
+    pitches = np.where(delta >= 0, pitches + 12 * ((delta + 5) // 12), pitches - 12 * ((5 - delta) // 12))
+
+    pitches = np.where(pitches < LOWEST, pitches + 12 * ((LOWEST - pitches + 11) // 12), pitches)
+    pitches = np.where(pitches > HIGHEST, pitches - 12 * ((pitches - HIGHEST + 11) // 12), pitches)
+
+    return pitches
+
+
+# Lookup table of each MIDI note number (row) placed after each register (column), as an offset from LOWEST; the last
+# row, for rests, keeps the register
+register_tables = np.vstack([closest_pitches(register_range, np.arange(128)[:, None]),
+                             register_range]).astype(np.intp) - LOWEST
+
+
+def assign_registers(pitches, start=None):
+    """Returns the register of every note of one or more voices, exactly as chaining find_closest() along each
+    voice would place them ~
+
+    @type pitches: np.ndarray
+        MIDI note numbers of shape (..., notes); REST for rests, which keep the previous note for the next
+    @type start: np.ndarray | None
+        the note before the first of each voice, of shape (...); if None, it is the voice's first pitch (0 if a rest),
+        as in generate_track()
+    @rtype: np.ndarray
+        same shape as pitches; rests stay REST
+    """
+
+    pitches = np.asarray(pitches)
+    if pitches.shape[-1] == 0:
+        return pitches.copy()
+
+    if start is None:
+        start = np.where(pitches[..., 0] == REST, 0, pitches[..., 0])
+
+    rests = pitches == REST
+    first = np.argmax(~rests, axis=-1)[..., None]
+
+    # A note placed after a register of its own pitch class keeps that register, so starting every voice on the
+    # register of its first note places that note as start would, and keeps every register within [60, 84]
+    registers = closest_pitches(np.asarray(start)[..., None], np.take_along_axis(pitches, first, axis=-1))[..., 0]
+    registers = (registers - LOWEST).astype(np.intp).reshape(-1)
+
+    rows = np.where(rests, len(register_tables) - 1, pitches).reshape(-1, pitches.shape[-1])
+    placed = np.empty(rows.shape, dtype=np.intp)
+    for i in range(rows.shape[1]):
+        registers = register_tables[rows[:, i], registers]
+        placed[:, i] = registers
+
+    return np.where(rests, REST, placed.reshape(pitches.shape) + LOWEST).astype(pitches.dtype)
+
+
+def stack_voicings(pitches, start=None):
+    """Returns registers for the voices of a sequence of chords, led jointly: the bottom voice is placed by
+    assign_registers(), and every voice above it is the lowest note of its pitch class above the voice below ~
+
+    @type pitches: np.ndarray
+        MIDI note numbers of shape (voices, chords), bottom voice first; REST where a chord lacks a voice
+    @type start: int | None
+        the note before the bottom voice's first; see assign_registers()
+    @rtype: np.ndarray
+    """
+
+    pitches = np.asarray(pitches)
+    registers = np.empty_like(pitches)
+    registers[0] = assign_registers(pitches[0], start)
+
+    below = registers[0]
+    for i in range(1, pitches.shape[0]):
+        stacked = below + 1 + (pitches[i] - below - 1) % 12
+        registers[i] = np.where((pitches[i] == REST) | (below == REST), REST, stacked)
+        below = np.where(registers[i] == REST, below, registers[i])
+
+    return registers
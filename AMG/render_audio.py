@@ -0,0 +1,173 @@
+"""Renders a written Loop or Song to audio offline, by mixing the bundled .wav samples with NumPy ~
+
+Every event of a Timeline starts one sample at its onset; samples are cut to the event's length (with a short fade)
+and overlap-added into one stereo buffer, such that no sound card or real-time playback is needed ~
+"""
+
+from class_timeline import *
+from class_sample_bank import SampleBank, instrument_samples, derived_samples
+from midi_encoding import STEP_TICKS
+from midi_generation import notes_flat
+import numpy as np
+import os
+
+SAMPLE_RATE = 44100
+
+# Seconds per step, as the MIDI files of loop_midi play at 480 ticks per beat and 120 beats per minute
+STEP_SECONDS = STEP_TICKS / 480 * 0.5
+
+# Directory holding the .wav samples
+sample_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Melody samples, one per semi-tone; MIDI 60 plays the lowest
+melody_samples = instrument_samples['melody']
+
+# Sample of each drum part; perc_high and perc_mid are percussion loops, of which a hat plays the opening
+drum_samples = {'kick': 'kick', 'snare': 'clap', 'closed_hat': 'perc_high', 'open_hat': 'perc_mid'}
+
+# Drum parts whose samples are one-shots, played out in full rather than cut to the event's length
+one_shot_parts = ('kick', 'snare')
+
+# Gain of each part at velocity 64, after basic_ui's volumes
+part_gains = {'harm': 0.5, 'melody': 1.0, 'bass': 0.7, 'kick': 1.0, 'snare': 1.0, 'closed_hat': 0.5, 'open_hat': 0.5}
+
+# Samples of every render which is not given its own SampleBank; every derived pitch is kept (about 1.4 MB each, as
+# 16-bit frames), such that a batch of renders derives each pitch once
+sample_bank = SampleBank(sample_dir, derived_capacity=len(derived_samples))
+
+
+def load_sample(name, bank=None):
+    """Returns the 16-bit frames of a sample, of shape (frames, channels); see SampleBank.sample_frames() ~
+
+    @type name: str
+        e.g. 'bassF_'
+    @type bank: SampleBank | None
+        if None, sample_bank
+    @rtype: np.ndarray
+    """
+
+    if bank is None:
+        bank = sample_bank
+
+    frames = bank.sample_frames(name)
+    if bank.rates[name] != SAMPLE_RATE:
+        raise ValueError('{}.wav is not at {} Hz'.format(name, SAMPLE_RATE))
+
+    return frames
+
+
+def event_sample(part, pitch):
+    """Returns the name of the sample an event of part plays at a MIDI pitch ~
+    Harmony and bass samples only depend on the pitch class; melody pitches above the highest sample drop by octaves ~
+
+    @type part: str
+    @type pitch: int
+    @rtype: str
+    """
+
+    if part in drum_samples:
+        return drum_samples[part]
+
+    if part == 'melody':
+        index = pitch - 60
+        while index >= len(melody_samples):
+            index -= 12
+        while index < 0:
+            index += 12
+        return melody_samples[index]
+
+    name = notes_flat[(pitch - 57) % 12].replace('Gb', 'F_')
+    if part == 'bass':
+        return 'bass' + name
+    return name
+
+
+def render_timeline(timeline, step_seconds=STEP_SECONDS, release=0.03, bank=None):
+    """Returns a Timeline mixed down to a stereo buffer of floats, of shape (frames, 2) ~
+
+    Events are overlap-added one slice at a time; each (sample, length, gain) is cut from the 16-bit frames, scaled to
+    floats, and faded once, such that an event costs a single vectorised add, and only the slices a render plays are
+    ever held as floats. The buffer runs past the Timeline's end for as long as any sound rings ~
+
+    @type timeline: Timeline
+    @type step_seconds: float
+    @type release: float
+        seconds over which a cut sample fades out
+    @type bank: SampleBank | None
+        see load_sample()
+    @rtype: np.ndarray
+    """
+
+    step_frames = step_seconds * SAMPLE_RATE
+    release_frames = int(release * SAMPLE_RATE)
+    samples = {}
+    slices = {}
+    sounds = []
+    end = int(round(timeline.length * step_frames))
+
+    for onset, duration, part, pitch, velocity in zip(timeline.onset.tolist(), timeline.duration.tolist(),
+                                                      timeline.part.tolist(), timeline.pitch.tolist(),
+                                                      timeline.velocity.tolist()):
+        part = part_names[part]
+        name = event_sample(part, pitch)
+        if name not in samples:
+            samples[name] = load_sample(name, bank)
+        sample = samples[name]
+
+        if part in one_shot_parts:
+            frames = len(sample)
+        else:
+            frames = min(int(round(duration * step_frames)) + release_frames, len(sample))
+
+        key = (name, frames, velocity, part)
+        if key not in slices:
+            cut = sample[:frames].astype(np.float32)
+            if cut.shape[1] == 1:
+                cut = np.repeat(cut, 2, axis=1)
+            cut *= part_gains[part] * velocity / 64 / 32768
+            if frames < len(sample):
+                fade = min(release_frames, frames)
+                cut[frames - fade:] *= np.linspace(1, 0, fade, dtype=np.float32)[:, None]
+            slices[key] = cut
+
+        start = int(round(onset * step_frames))
+        sounds.append((start, slices[key]))
+        end = max(end, start + frames)
+
+    mix = np.zeros((end, 2), dtype=np.float32)
+    for start, cut in sounds:
+        mix[start:start + len(cut)] += cut
+
+    return mix
+
+
+def render_loop(curr_loop, repeats=1, step_seconds=STEP_SECONDS, bank=None):
+    """Returns a written Loop (curr_loop), played (repeats) times over, as a stereo buffer; see render_timeline() ~
+
+    @type curr_loop: Loop
+    @type repeats: int
+    @type step_seconds: float
+    @type bank: SampleBank | None
+    @rtype: np.ndarray
+    """
+
+    return render_timeline(concatenate_timelines([curr_loop.to_events()] * repeats), step_seconds, bank=bank)
+
+
+def wav_bytes(mix, gain=0.5):
+    """Returns the bytes of a 16-bit stereo .wav file of a buffer from render_timeline() ~
+    The buffer is scaled by gain, and anything still beyond full scale is clipped ~
+
+    @type mix: np.ndarray
+    @type gain: float
+    @rtype: bytes
+    """
+
+    pcm = np.clip(mix * (gain * 32768), -32768, 32767).astype('<i2')
+
+    header = b'RIFF' + (36 + pcm.nbytes).to_bytes(4, 'little') + b'WAVEfmt ' + (16).to_bytes(4, 'little') + \
+        (1).to_bytes(2, 'little') + (2).to_bytes(2, 'little') + SAMPLE_RATE.to_bytes(4, 'little') + \
+        (SAMPLE_RATE * 4).to_bytes(4, 'little') + (4).to_bytes(2, 'little') + (16).to_bytes(2, 'little') + \
+        b'data' + pcm.nbytes.to_bytes(4, 'little')
+
+    return header + pcm.tobytes()
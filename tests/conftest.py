@@ -0,0 +1,6 @@
+"""Puts the AMG modules on the import path, as they import each other by their bare names ~ """
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'AMG'))
@@ -0,0 +1,83 @@
+"""Checks the Standard MIDI Files written by midi_encoding against mido's parser ~ """
+
+import io
+
+import mido
+from mido.midifiles.meta import encode_variable_int
+from mido.midifiles.midifiles import read_variable_int
+import pytest
+
+from class_loop import Loop
+from loop_midi import loop_to_midi, loop_to_smf
+from midi_encoding import encode_vlq, STEP_TICKS
+from midi_generation import midi_buffer
+
+# Variable-length quantities on either side of each change in their length, up to the largest MIDI allows
+vlq_boundaries = [(0, 1), (0x7F, 1), (0x80, 2), (0x3FFF, 2), (0x4000, 3), (0x0FFFFFFF, 4)]
+
+
+def written_loop(seed, measures, intensity=2):
+    """Returns a Loop written from seed ~
+
+    @type seed: int
+    @type measures: int
+    @type intensity: int
+    @rtype: Loop
+    """
+
+    curr_loop = Loop(measures, intensity, seed=seed)
+    curr_loop.write_loop()
+
+    return curr_loop
+
+
+def note_ons(track):
+    """Returns the (absolute tick, note, velocity) of every note_on message of a track ~
+
+    @type track: mido.MidiTrack
+    @rtype: list[(int, int, int)]
+    """
+
+    tick = 0
+    notes = []
+    for message in track:
+        tick += message.time
+        if message.type == 'note_on':
+            notes.append((tick, message.note, message.velocity))
+
+    return notes
+
+
+@pytest.mark.parametrize('value, size', vlq_boundaries)
+def test_vlq_round_trip(value, size):
+    data = bytearray()
+    encode_vlq(value, data)
+
+    assert len(data) == size
+    assert list(data) == encode_variable_int(value)
+    assert read_variable_int(io.BytesIO(bytes(data))) == value
+
+
+@pytest.mark.parametrize('loop_markers', [False, True])
+@pytest.mark.parametrize('measures', [2, 4, 8])
+def test_loop_to_smf_parses(measures, loop_markers):
+    repeats = 3
+    length = 8 * measures * STEP_TICKS
+
+    for seed in range(20):
+        smf = mido.MidiFile(file=io.BytesIO(loop_to_smf(written_loop(seed, measures), repeats, loop_markers)))
+        mid = loop_to_midi(written_loop(seed, measures), repeats, loop_markers)
+        written = mido.MidiFile(file=midi_buffer(mid))
+
+        assert smf.type == 1 and smf.ticks_per_beat == 480
+        assert len(smf.tracks) == len(mid.tracks) == len(written.tracks)
+        assert note_ons(smf.tracks[0]), 'no harmony notes'
+
+        for smf_track, mid_track, written_track in zip(smf.tracks, mid.tracks, written.tracks):
+            assert sum(message.time for message in smf_track) == length * (1 if loop_markers else repeats)
+            assert sum(message.time for message in mid_track) == length, 'a track holds more than one pass'
+            assert note_ons(smf_track) == note_ons(written_track)
+
+            if loop_markers:
+                assert [message.text for message in smf_track if message.type == 'marker'] == \
+                    ['loopStart', 'loopEnd']
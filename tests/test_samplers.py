@@ -0,0 +1,282 @@
+"""Checks that the direct samplers draw from the same distributions as the rejection loops they replaced ~
+
+Each test keeps a copy of the old loop, draws from it with a seeded rng, and compares the counts against the
+probabilities of the new sampler's table with a chi-square test ~
+"""
+
+from itertools import product
+import random
+
+import pytest
+
+from class_loop import rhythm_gaps
+from harmony_shell import families, family_table, resolution_table
+from melody_rhythm import rest_table
+
+# Tritone ratings a Loop may be written with: intensity 0 to 4, plus or minus one
+tritones = range(-1, 6)
+
+# Every dominant chord resolved by dominant_resolution()'s table, in a fixed order
+dominant_chords = list(dict.fromkeys(chord for curr_family in families for chord in curr_family.chords
+                                     if chord.quality == 'dominant' and chord.name != 'V7ofbII'))
+
+# rhythm_refs to draw rests for; each leaves room for the most rests assign_rests() asks for
+rhythm_refs = [(0, 0, 0, 0, 0, 0, 0, 0), (1, 0, 0, 0, 0, 0, 0, 0), (1, 0, 0, 0, 1, 0, 0, 0), (0, 1, 1, 0, 0, 0, 1, 0),
+               (1, 1, 0, 1, 0, 1, 0, 1), (0, 0, 1, 1, 1, 1, 0, 0)]
+
+
+def probabilities(cumulative):
+    """Returns the probability of each entry of a table of cumulative weights ~
+
+    @type cumulative: (int | float, ...)
+    @rtype: list[float]
+    """
+
+    return [(weight - prev) / cumulative[-1] for prev, weight in zip((0,) + tuple(cumulative), cumulative)]
+
+
+def chi_square(counts, chances):
+    """Returns the chi-square statistic of counts against chances, and its degrees of freedom ~
+    Outcomes expected fewer than 5 times are pooled into one ~
+
+    @type counts: dict{object: int}
+    @type chances: dict{object: float}
+    @rtype: (float, int)
+    """
+
+    assert set(counts) <= {outcome for outcome, chance in chances.items() if chance > 0}, 'impossible outcome drawn'
+
+    total = sum(counts.values())
+    statistic = 0.0
+    bins = 0
+    pooled_count = 0
+    pooled_expected = 0.0
+
+    for outcome, chance in chances.items():
+        expected = chance * total
+        if expected < 5:
+            pooled_count += counts.get(outcome, 0)
+            pooled_expected += expected
+        else:
+            statistic += (counts.get(outcome, 0) - expected) ** 2 / expected
+            bins += 1
+
+    if pooled_expected > 0:
+        statistic += (pooled_count - pooled_expected) ** 2 / pooled_expected
+        bins += 1
+
+    return statistic, bins - 1
+
+
+def bound(dof):
+    """Returns the chi-square value exceeded with chance 1 in 10000 at dof degrees of freedom (Wilson-Hilferty) ~
+
+    @type dof: int
+    @rtype: float
+    """
+
+    if dof == 0:
+        return 0.0
+
+    return dof * (1 - 2 / (9 * dof) + 3.719 * (2 / (9 * dof)) ** 0.5) ** 3
+
+
+def assert_same(draw, chances, n, seed):
+    """Draws n outcomes from draw(rng) and asserts that they fit chances ~
+
+    @type draw: function
+    @type chances: dict{object: float}
+    @type n: int
+    @type seed: int
+    @rtype: None
+    """
+
+    rng = random.Random(seed)
+    counts = {}
+    for _ in range(n):
+        outcome = draw(rng)
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+    statistic, dof = chi_square(counts, chances)
+    assert statistic <= bound(dof), 'chi-square {:.2f} on {} dof'.format(statistic, dof)
+
+
+def old_family_list(key_quality, tritone):
+    """Returns every family repeated by its weight, as the old choose_family() built it on every call ~
+
+    @type key_quality: str
+    @type tritone: int
+    @rtype: list[Family]
+    """
+
+    return_families = []
+    for curr_family in families:
+        for _ in range(curr_family.get_weight(key_quality, tritone)):
+            return_families.append(curr_family)
+
+    return return_families
+
+
+def old_final_family(rng, return_families):
+    """Copy of the old final-measure loop of shell_chord() ~
+
+    @type rng: random.Random
+    @type return_families: list[Family]
+    @rtype: Family
+    """
+
+    while True:
+        chord_family = rng.choice(return_families)
+        if chord_family.chords[0].quality != 'dominant' or \
+                chord_family.chords[0].quality == 'dominant' and chord_family.chords[0].name == 'V7':
+            return chord_family
+
+
+def old_resolution(rng, return_families, prev_chord, final):
+    """Copy of the old case II loop of dominant_resolution() ~
+
+    @type rng: random.Random
+    @type return_families: list[Family]
+    @type prev_chord: Chord
+    @type final: bool
+    @rtype: Chord
+    """
+
+    e = True
+    while e:
+        chord_family = rng.choice(return_families)
+        return_chords = []
+        return_chord = None
+
+        for chord_change in chord_family.chords:
+            if (prev_chord.interval - chord_change.interval) % 12 == 7:
+                e = False
+                return_chords.append(chord_change)
+                if prev_chord.name[:5] != 'subV7':
+                    return_chords.extend([chord_change, chord_change, chord_change])
+
+            if (prev_chord.interval - chord_change.interval) % 12 == 10:
+                return_chords.append(chord_change)
+
+            if (prev_chord.interval - chord_change.interval) % 12 == 1:
+                e = False
+                return_chords.append(chord_change)
+                if prev_chord.name[:5] == 'subV7':
+                    return_chords.extend([chord_change, chord_change, chord_change])
+
+        if len(return_chords) > 0:
+            return_chord = rng.choice(return_chords)
+
+        if final and return_chord is not None:
+            if return_chord.quality == 'dominant' and return_chord.name != 'V7':
+                e = True
+
+    return return_chord
+
+
+def old_rhythm_ref(rng):
+    """Copy of the old Loop.create_rhythm_ref() ~
+
+    @type rng: random.Random
+    @rtype: (int, ...)
+    """
+
+    return_lst = [0, 0, 0, 0, 0, 0, 0, 0]
+    hits_total = rng.choice([1, 2, 2, 3, 3, 3, 3, 3, 3, 4, 4])
+    hit_count = 0
+
+    while True:
+        for i, hit in enumerate(return_lst):
+            if hit_count == hits_total:
+                return tuple(return_lst)
+
+            if rng.randint(0, 100) == 77:
+                return_lst[i] = 1
+                hit_count += 1
+
+
+def old_rests(rng, rhythm_ref):
+    """Copy of the old assign_rests() on an empty measure; returns the rests as a bit mask ~
+
+    @type rng: random.Random
+    @type rhythm_ref: (int, ...)
+    @rtype: int
+    """
+
+    values = [None] * 8
+    rest_amount = rng.randint(0, 3)
+    rest_count = 0
+
+    def pattern():
+        return sum(1 << i for i, value in enumerate(values) if value == 'R')
+
+    while rest_count < rest_amount:
+        for i in range(8):
+            if values[i] is None and rng.randint(0, 10) == 0 and rhythm_ref[i] != 1:
+                values[i] = 'R'
+                rest_count += 1
+
+            if values[i] == 'R' and rng.randint(0, 4) == 0 and i != 7:
+                if rhythm_ref[i + 1] != 1 and rng.randint(0, 2) > 0:
+                    values[i + 1] = 'R'
+                    rest_count += 1
+
+            if values[i] == 'R' and rng.randint(0, 4) == 0 and i != 0:
+                if rhythm_ref[i - 1] != 1 and rng.randint(0, 2) > 0:
+                    values[i - 1] = 'R'
+                    rest_count += 1
+
+            if rest_count == rest_amount:
+                return pattern()
+
+    return pattern()
+
+
+@pytest.mark.parametrize('key_quality', ['major', 'minor'])
+@pytest.mark.parametrize('tritone', tritones)
+def test_final_family(key_quality, tritone):
+    return_families = old_family_list(key_quality, tritone)
+    chances = dict(zip(families, probabilities(family_table(key_quality, tritone, True))))
+
+    assert_same(lambda rng: old_final_family(rng, return_families), chances, 20000, tritone)
+
+
+@pytest.mark.parametrize('final', [False, True])
+@pytest.mark.parametrize('key_quality', ['major', 'minor'])
+@pytest.mark.parametrize('tritone', tritones)
+def test_resolution(key_quality, tritone, final):
+    return_families = old_family_list(key_quality, tritone)
+
+    for i, prev_chord in enumerate(dominant_chords):
+        chords, table = resolution_table(key_quality, tritone, prev_chord, final)
+        chances = dict(zip(chords, probabilities(table)))
+
+        assert_same(lambda rng: old_resolution(rng, return_families, prev_chord, final), chances, 2000, i)
+
+
+def test_rhythm_gaps():
+    hits_choices = [1, 2, 2, 3, 3, 3, 3, 3, 3, 4, 4]
+    gap_chances = probabilities(rhythm_gaps)
+    chances = {}
+
+    for hits_total in set(hits_choices):
+        for gaps in product(range(8), repeat=hits_total):
+            rhythm_ref = [0] * 8
+            chance = hits_choices.count(hits_total) / len(hits_choices)
+            i = -1
+            for gap in gaps:
+                i = (i + 1 + gap) % 8
+                rhythm_ref[i] = 1
+                chance *= gap_chances[gap]
+
+            chances[tuple(rhythm_ref)] = chances.get(tuple(rhythm_ref), 0) + chance
+
+    assert_same(old_rhythm_ref, chances, 10000, 0)
+
+
+@pytest.mark.parametrize('rhythm_ref', rhythm_refs)
+def test_rest_table(rhythm_ref):
+    patterns, cumulative = rest_table(list(rhythm_ref))
+    chances = dict(zip(patterns, probabilities(cumulative)))
+
+    assert_same(lambda rng: old_rests(rng, rhythm_ref), chances, 20000, sum(rhythm_ref))
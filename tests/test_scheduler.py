@@ -0,0 +1,80 @@
+"""Checks that Schedulers restore the interpreter's switch interval, and dispatch on time beside a busy thread ~ """
+
+import statistics
+import sys
+import threading
+
+import pytest
+
+from class_scheduler import Scheduler, SWITCH_INTERVAL
+
+# Switch interval set before each test, unlike both the interpreter's default and SWITCH_INTERVAL
+OUTSIDE_INTERVAL = 0.003
+
+
+@pytest.fixture(autouse=True)
+def outside_interval():
+    saved = sys.getswitchinterval()
+    sys.setswitchinterval(OUTSIDE_INTERVAL)
+    yield
+    sys.setswitchinterval(saved)
+
+
+def running_scheduler():
+    """Returns a started Scheduler which plays until stopped, once its thread has called its first event ~
+
+    @rtype: Scheduler
+    """
+
+    started = threading.Event()
+    scheduler = Scheduler([(0.0, started.set, ())], period=0.01)
+    scheduler.start()
+    assert started.wait(5), 'the scheduler did not start'
+
+    return scheduler
+
+
+def busy(stopped):
+    """Holds the GIL as much as the interpreter allows, until stopped ~
+
+    @type stopped: threading.Event
+    @rtype: None
+    """
+
+    while not stopped.is_set():
+        sum(range(1000))
+
+
+@pytest.mark.parametrize('stop_order', [(0, 1), (1, 0)])
+def test_overlapping_schedulers(stop_order):
+    schedulers = [running_scheduler(), running_scheduler()]
+    assert sys.getswitchinterval() == pytest.approx(SWITCH_INTERVAL)
+
+    schedulers[stop_order[0]].stop()
+    assert sys.getswitchinterval() == pytest.approx(SWITCH_INTERVAL), 'restored while a scheduler still runs'
+
+    schedulers[stop_order[1]].stop()
+    assert sys.getswitchinterval() == OUTSIDE_INTERVAL
+
+
+def test_restarted_after_stop():
+    for _ in range(3):
+        running_scheduler().stop()
+        assert sys.getswitchinterval() == OUTSIDE_INTERVAL
+
+
+def test_lateness_beside_busy_thread():
+    stopped = threading.Event()
+    thread = threading.Thread(target=busy, args=(stopped,), daemon=True)
+    thread.start()
+
+    try:
+        scheduler = Scheduler([(i * 0.005, lambda: None, ()) for i in range(100)])
+        scheduler.start()
+        scheduler.thread.join()
+    finally:
+        stopped.set()
+        thread.join()
+
+    # A busy thread holding the GIL for a whole OUTSIDE_INTERVAL would make most events about that late
+    assert statistics.median(scheduler.lateness) < 0.001